@@ -0,0 +1,109 @@
+import queue
+import threading
+
+import metrics
+
+# Loads a user's saved attempts on a background thread, so the summary window never waits on the results store. The
+# first time a user's folder is read the file store has to scan it (refer to AttemptIndex in results_store.py), which
+# can take a while with lots of results.
+#
+# The loader counts the attempts (and totals their scores) first, then loads pages of attempts as they're asked for.
+# Everything it loads waits in a queue until poll is called from the main thread, the same way the ResultWriter's
+# callbacks do (refer to result_writer.py)
+
+
+class AttemptLoader:
+    def __init__(self, store, username, first_date=None, end_date=None, page_size=50):
+        self.store = store
+        self.username = username
+
+        self.first_date = first_date
+        self.end_date = end_date
+
+        self.page_size = page_size
+
+        self.page_requests = queue.Queue()
+        self.loaded = queue.Queue()
+
+        # Page numbers that have been asked for but haven't been loaded yet
+        self.requested_pages = set()
+
+        self.cancelled = threading.Event()
+
+        self.thread = threading.Thread(target=self.run, name="AttemptLoader", daemon=True)
+        self.thread.start()
+
+    # Asks for a page of attempts to be loaded (unless it's already on its way)
+    def request_page(self, page_number):
+        if page_number in self.requested_pages or self.cancelled.is_set():
+            return
+
+        self.requested_pages.add(page_number)
+        self.page_requests.put(page_number)
+
+    # The worker thread. Counts the attempts, then loads pages until it's cancelled
+    def run(self):
+        try:
+            totals = self.get_totals()
+        except Exception as error:
+            self.loaded.put(("error", error))
+
+            return
+
+        if self.cancelled.is_set():
+            return
+
+        self.loaded.put(("count", totals))
+
+        while True:
+            page_number = self.page_requests.get()
+
+            if page_number is None or self.cancelled.is_set():
+                return
+
+            try:
+                attempts = self.load_page(page_number)
+            except Exception as error:
+                self.loaded.put(("error", error))
+
+                return
+
+            if self.cancelled.is_set():
+                return
+
+            self.loaded.put(("page", page_number, attempts))
+
+    # Counts the attempts that match the filter, and totals their scores and question counts. The first time a folder is
+    # counted the file store scans it
+    @metrics.timed("summary_scan")
+    def get_totals(self):
+        return self.store.get_user_totals(self.username, self.first_date, self.end_date)
+
+    @metrics.timed("summary_page_load")
+    def load_page(self, page_number):
+        return self.store.list_attempts(self.username, page_number * self.page_size, self.page_size, self.first_date,
+                                        self.end_date)
+
+    # Runs on_count((attempt count, total score, total question count)), on_page(page_number, attempts) or
+    # on_error(error) for everything that's been loaded since the last poll. This needs to be called from the main
+    # thread
+    def poll(self, on_count, on_page, on_error):
+        while not self.cancelled.is_set():
+            try:
+                message = self.loaded.get_nowait()
+            except queue.Empty:
+                return
+
+            if message[0] == "count":
+                on_count(message[1])
+            elif message[0] == "page":
+                self.requested_pages.discard(message[1])
+
+                on_page(message[1], message[2])
+            else:
+                on_error(message[1])
+
+    # Stops loading. Anything the worker thread is in the middle of loading gets thrown away
+    def cancel(self):
+        self.cancelled.set()
+        self.page_requests.put(None)
@@ -0,0 +1,267 @@
+import json
+import os
+import sys
+
+import numpy
+
+import grading
+from question_bank import QuestionBank
+from results_store import DATABASE_FILE_NAME, SAV_IMPORT_KEY, SqliteResultsStore
+
+# Re-grades saved results against the current question bank, for when an answer key changes. Results can be .sav files
+# or the attempts in a results store (like the quiz's SQLite database). Every saved
+# answer to the same question is graded at once: the selections are packed into a boolean matrix (one row per saved
+# answer, one column per possible answer) and graded with a few NumPy operations over the whole matrix.
+#
+# Saved results don't store question IDs, so saved answers are matched to the bank by question text. Answers to
+# questions that aren't in the bank anymore keep their old result.
+#
+# Usage:
+#   python batch_grading.py [--write] [--sqlite results.sqlite3] [result folders or files...]
+#
+# With no database, folders or files given, the results the quiz reads are re-graded: its SQLite database if the .sav
+# files have been copied into it (refer to create_results_store in main.py), otherwise every user's .sav files
+
+
+# The result of re-grading one result file, or one attempt from a results store
+class RegradedResult:
+    def __init__(self, path, data, attempt=None):
+        self.path = path
+        self.data = data
+
+        # The attempt the result was loaded from, if it came from a results store
+        self.attempt = attempt
+
+        self.old_correct = [answer[2] for answer in data]
+        self.new_correct = list(self.old_correct)
+
+    # Gets the indexes of the answers whose result changed
+    def get_changed(self):
+        return [i for i in range(0, len(self.data)) if self.old_correct[i] != self.new_correct[i]]
+
+    def get_old_score(self):
+        return sum(1 for correct in self.old_correct if correct)
+
+    def get_new_score(self):
+        return sum(1 for correct in self.new_correct if correct)
+
+    # Gets what the result is called in the output
+    def get_name(self):
+        if self.attempt:
+            return self.attempt.username + " " + self.attempt.get_display_name()
+
+        return self.path
+
+
+# Finds every result file in the given folders (files are passed straight through)
+def find_result_files(paths):
+    for path in paths:
+        if os.path.isfile(path):
+            yield path
+
+            continue
+
+        for folder, _, file_names in os.walk(path):
+            for file_name in file_names:
+                if file_name.endswith(".sav"):
+                    yield os.path.join(folder, file_name)
+
+
+# Loads a result file's answer list
+def load_result_file(path):
+    with open(path, "r") as data:
+        return json.loads(data.readline())
+
+
+# Checks whether the quiz has a database with its .sav files copied into it. Until it does, the .sav files are still the
+# full results
+def has_imported_database(database_path):
+    if not os.path.exists(database_path):
+        return False
+
+    store = SqliteResultsStore(database_path)
+
+    try:
+        return bool(store.get_meta(SAV_IMPORT_KEY))
+    finally:
+        store.close()
+
+
+# Loads every attempt in a results store, ready to be re-graded
+def load_store_results(store):
+    return [RegradedResult(None, store.load_result(attempt), attempt)
+            for username in store.list_usernames() for attempt in store.list_attempts(username)]
+
+
+# Grades every saved answer to one question in a single pass. rows are (result, answer index) pairs and selections
+# are the possible answer indexes each row selected (len(question.possible) meaning an answer that isn't possible)
+def regrade_question(question, rows, selections):
+    answer_count = len(question.possible)
+
+    row_indexes = numpy.repeat(numpy.arange(len(selections)), [len(selected) for selected in selections])
+    column_indexes = numpy.fromiter((column for selected in selections for column in selected), dtype=numpy.intp,
+                                    count=len(row_indexes))
+
+    # The extra column is for selected answers that aren't possible answers, which always count as wrong
+    selected = numpy.zeros((len(selections), answer_count + 1), dtype=bool)
+    selected[row_indexes, column_indexes] = True
+
+    correct = numpy.zeros(answer_count + 1, dtype=bool)
+    correct[0:answer_count] = [question.correct_mask >> answer_index & 1 for answer_index in range(0, answer_count)]
+
+    any_wrong = (selected & ~correct).any(axis=1)
+    correct_count = (selected & correct).sum(axis=1)
+
+    if question.answer_type == grading.ALL_ANSWERS:
+        passed = correct_count == correct.sum()
+    elif question.answer_type == grading.ONE_ANSWER:
+        passed = correct_count >= 1
+    elif question.answer_type == grading.MORE_THAN_ONE_ANSWER:
+        passed = correct_count > 1
+    else:
+        passed = numpy.zeros(len(selections), dtype=bool)
+
+    passed &= ~any_wrong
+
+    for (result, answer_index), answer_passed in zip(rows, passed.tolist()):
+        result.new_correct[answer_index] = answer_passed
+
+
+# Re-grades many result files against a list of questions (like a QuestionBank)
+def regrade_results(paths, questions):
+    return regrade([RegradedResult(path, load_result_file(path)) for path in paths], questions)
+
+
+# Re-grades loaded RegradedResults against a list of questions. Gives back the results and the questions by their text
+def regrade(results, questions):
+    questions_by_text = {question.question_text: question for question in questions}
+
+    # Question text -> {possible answer: index}, only built for questions that have saved answers
+    possible_indexes_by_text = {}
+
+    # Question text -> ([(result, answer index)], [selected possible answer indexes])
+    groups = {}
+
+    for result in results:
+        for answer_index in range(0, len(result.data)):
+            question_text = result.data[answer_index][0]
+            input_answers = result.data[answer_index][4]
+
+            question = questions_by_text.get(question_text)
+
+            if not question:
+                continue
+
+            possible_indexes = possible_indexes_by_text.get(question_text)
+
+            if possible_indexes is None:
+                possible_indexes = {question.possible[i]: i for i in range(len(question.possible) - 1, -1, -1)}
+                possible_indexes_by_text[question_text] = possible_indexes
+
+            not_possible = len(question.possible)
+
+            rows, selections = groups.setdefault(question_text, ([], []))
+            rows.append((result, answer_index))
+            selections.append([possible_indexes.get(answer, not_possible) for answer in input_answers])
+
+    for question_text, (rows, selections) in groups.items():
+        regrade_question(questions_by_text[question_text], rows, selections)
+
+    return results, questions_by_text
+
+
+# Updates a re-graded result's saved correct and missed answers to the current bank
+def update_regraded_data(result, questions_by_text):
+    for answer_index in range(0, len(result.data)):
+        answer = list(result.data[answer_index])
+        question = questions_by_text.get(answer[0])
+
+        if question:
+            answer[2] = result.new_correct[answer_index]
+            answer[3] = question.possible
+            answer[6] = question.correct
+
+            if answer[1] != 3:
+                selected_mask = grading.get_answers_mask(question.possible, answer[4])
+                answer[5] = grading.get_mask_answers(question.possible,
+                                                     grading.get_missed_mask(selected_mask, question.correct_mask))
+
+        result.data[answer_index] = answer
+
+
+# Writes a re-graded result back to its file
+def write_regraded_result(result, questions_by_text):
+    update_regraded_data(result, questions_by_text)
+
+    temp_path = result.path + ".tmp"
+    with open(temp_path, "w") as data:
+        data.write(json.dumps(result.data))
+
+    os.replace(temp_path, result.path)
+
+
+# Writes re-graded results back to the store they were loaded from, all at once
+def write_regraded_store_results(store, results, questions_by_text):
+    for result in results:
+        update_regraded_data(result, questions_by_text)
+
+    store.update_results([(result.attempt, result.data) for result in results])
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+
+    write = "--write" in arguments
+    if write:
+        arguments.remove("--write")
+
+    database_path = None
+    if "--sqlite" in arguments:
+        database_position = arguments.index("--sqlite")
+        database_path = arguments[database_position + 1]
+
+        del arguments[database_position:database_position + 2]
+
+    if not arguments and not database_path:
+        import platformdirs
+
+        main_path = platformdirs.user_data_dir("AnF2023Quiz", "FHSAnF")
+        database_path = os.path.join(main_path, DATABASE_FILE_NAME)
+
+        if not has_imported_database(database_path):
+            database_path = None
+            arguments = [main_path]
+
+    store = database_path and SqliteResultsStore(database_path)
+
+    if store:
+        print("Re-grading the results in " + database_path)
+
+        regraded, bank_questions = regrade(load_store_results(store), QuestionBank())
+    else:
+        regraded, bank_questions = regrade_results(list(find_result_files(arguments)), QuestionBank())
+
+    changed_results = []
+    for regraded_result in regraded:
+        changed = regraded_result.get_changed()
+
+        if not changed:
+            continue
+
+        changed_results.append(regraded_result)
+
+        print(regraded_result.get_name() + ": " + str(regraded_result.get_old_score()) + " -> " +
+              str(regraded_result.get_new_score()) + " (" + str(len(changed)) + " answers changed)")
+
+    if write:
+        if store:
+            write_regraded_store_results(store, changed_results, bank_questions)
+        else:
+            for regraded_result in changed_results:
+                write_regraded_result(regraded_result, bank_questions)
+
+    if store:
+        store.close()
+
+    print("Re-graded " + str(len(regraded)) + " results, " + str(len(changed_results)) + " changed" +
+          (write and " and saved" or ""))
@@ -0,0 +1,5 @@
+# Benchmarks for the quiz. Each benchmark can be run from the repository root, e.g.:
+#   python -m benchmarks.sampling
+# or the whole suite can be run at once, with results saved as JSON to compare against later runs (refer to
+# __main__.py):
+#   python -m benchmarks --output results.json
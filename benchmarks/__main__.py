@@ -0,0 +1,182 @@
+import importlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import tkinter
+from datetime import datetime
+
+# Runs the benchmark suite and saves machine readable results, so runs can be compared to find regressions:
+#   python -m benchmarks [names...] [--output results.json] [--compare old_results.json] [--threshold 0.1]
+#
+# Without any names the DEFAULT_BENCHMARKS are run. The rest need a display (summary_navigation, startup and
+# memory_soak) or take a while on their own (server_load and versions), so they only run when they're named. Benchmarks
+# that can't run here get skipped.
+#
+# Results are JSON, printed or saved to --output:
+#   {"python": ..., "platform": ..., "commit": ..., "date": ..., "benchmarks": {name: [result, ...]},
+#    "skipped": {name: reason}}
+# Every result is a dictionary. Its text fields (like a name or case) say what was measured, and its decimal fields are
+# the measurements. Measurements ending in _per_second are better when higher, the rest are better when lower.
+#
+# With --compare, every measurement is compared with the same one in an older results file, and any that got worse by
+# more than the threshold (10% by default) are listed. The exit code is 1 if there are any, or if any result says it's
+# leaking (like memory_soak's)
+
+BENCHMARKS = ("hot_paths", "sampling", "memory", "summary_navigation", "startup", "server_load", "versions",
+              "memory_soak")
+DEFAULT_BENCHMARKS = ("hot_paths", "sampling", "memory")
+
+DEFAULT_THRESHOLD = 0.1
+
+REPOSITORY_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Gets the commit the benchmarks are being run on, if it's a git checkout
+def get_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPOSITORY_PATH, capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return
+
+
+# Runs one benchmark module and gives back its results as a list
+def run_benchmark(name):
+    results = importlib.import_module("benchmarks." + name).run()
+
+    if isinstance(results, dict):
+        return [results]
+
+    return results
+
+
+def run_suite(names):
+    suite = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "commit": get_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "benchmarks": {},
+        "skipped": {}
+    }
+
+    for name in names:
+        print("Running " + name + "...", file=sys.stderr)
+
+        try:
+            suite["benchmarks"][name] = run_benchmark(name)
+        except (tkinter.TclError, RuntimeError, OSError) as error:
+            print("Skipped " + name + ": " + str(error), file=sys.stderr)
+
+            suite["skipped"][name] = str(error)
+
+    return suite
+
+
+# Gets the names of the benchmarks that found a leak
+def find_leaks(suite):
+    return [name for name, results in suite["benchmarks"].items() if any(result.get("leaking") for result in results)]
+
+
+# Gets the part of a result that says what was measured
+def get_result_key(result):
+    return {field: value for field, value in result.items() if not isinstance(value, float)}
+
+
+# Compares every measurement in two suite runs. Gives back (benchmark, result key, field, old, new, change) for every
+# measurement, where change is how much worse it got (negative when it got better)
+def compare_suites(old_suite, new_suite):
+    changes = []
+
+    for name, new_results in new_suite["benchmarks"].items():
+        old_results = old_suite["benchmarks"].get(name, [])
+
+        # Results come out in the same order every run, as long as they measured the same things
+        for old_result, new_result in zip(old_results, new_results):
+            key = get_result_key(new_result)
+
+            if get_result_key(old_result) != key:
+                continue
+
+            for field, new_value in new_result.items():
+                old_value = old_result.get(field)
+
+                if not isinstance(new_value, float) or not isinstance(old_value, float) or old_value == 0:
+                    continue
+
+                change = (new_value - old_value) / old_value
+                if field.endswith("_per_second"):
+                    change = -change
+
+                changes.append((name, key, field, old_value, new_value, change))
+
+    return changes
+
+
+def format_change(change):
+    name, key, field, old_value, new_value, worse_by = change
+
+    return (name + " " + json.dumps(key) + " " + field + ": " + format(old_value, ".3f") + " -> " +
+            format(new_value, ".3f") + " (" + format(worse_by * 100, "+.1f") + "%)")
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+
+    output_path = None
+    compare_path = None
+    threshold = DEFAULT_THRESHOLD
+
+    names = []
+    while arguments:
+        argument = arguments.pop(0)
+
+        if argument == "--output":
+            output_path = arguments.pop(0)
+        elif argument == "--compare":
+            compare_path = arguments.pop(0)
+        elif argument == "--threshold":
+            threshold = float(arguments.pop(0))
+        elif argument in BENCHMARKS:
+            names.append(argument)
+        else:
+            print("Unknown benchmark " + argument + " (the benchmarks are " + ", ".join(BENCHMARKS) + ")",
+                  file=sys.stderr)
+
+            sys.exit(2)
+
+    suite = run_suite(names or DEFAULT_BENCHMARKS)
+
+    if output_path:
+        with open(output_path, "w") as output:
+            json.dump(suite, output, indent=2)
+    else:
+        json.dump(suite, sys.stdout, indent=2)
+        print()
+
+    leaks = find_leaks(suite)
+
+    for name in leaks:
+        print("Leaking: " + name, file=sys.stderr)
+
+    regressions = []
+
+    if compare_path:
+        with open(compare_path, "r") as old_output:
+            changes = compare_suites(json.load(old_output), suite)
+
+        regressions = [change for change in changes if change[5] > threshold]
+        improvements = [change for change in changes if change[5] < -threshold]
+
+        print("Compared " + str(len(changes)) + " measurements with " + compare_path, file=sys.stderr)
+
+        for change in improvements:
+            print("Improved:  " + format_change(change), file=sys.stderr)
+
+        for change in regressions:
+            print("Regressed: " + format_change(change), file=sys.stderr)
+
+    if regressions or leaks:
+        sys.exit(1)
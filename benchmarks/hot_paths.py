@@ -0,0 +1,267 @@
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import timeit
+import tkinter
+from datetime import datetime, timedelta
+
+import grading
+import result_format
+from benchmarks.memory import load_table, make_bank_lines
+from benchmarks.sampling import best_time
+from question_bank import Question, QuestionBank
+from quiz_engine import QuestionSelector, QuizSession
+from results_store import FileResultsStore, SqliteResultsStore
+
+# Times the parts of the quiz that run the most, or that grow with how much has been saved:
+#   - QuestionSelector.setup (picking a quiz's questions)
+#   - grading a submitted answer, like submit_answer does
+#   - turning results into saved data and back
+#   - listing a page of attempts for the summary selector, with 10, 1k and 100k saved attempts
+#   - opening a saved attempt in the summary viewer
+#   - TkObject.set_visible and the layout pass after it
+#
+# Every result is {"name": ..., "case": ..., "time_us": ...} (refer to __main__.py for running the whole suite). The
+# 100k attempt listing makes 100k result files, so this takes a few minutes
+
+LISTING_SIZES = (10, 1000, 100000)
+
+# How many times each timing is repeated (the best one is kept)
+REPEAT = 5
+
+# How many attempts are shown per page in the summary selector (refer to SummaryScroller in main.py)
+PAGE_SIZE = 50
+
+
+# Times a function once, in microseconds (for things that change what they're timing, like building an index)
+def single_time(function):
+    return timeit.Timer(function).timeit(1) * 1000000
+
+
+def make_result(question_count, seed=0):
+    rng = random.Random(seed)
+    result = []
+
+    for i in range(0, question_count):
+        possible = ["Answer " + str(answer_index) for answer_index in range(0, rng.randrange(4, 10))]
+        correct = rng.random() < 0.5
+
+        result.append(["What is the answer to question " + str(i) + "?", 1, correct, possible, [possible[0]],
+                       correct and [] or [possible[1]], correct and [possible[0]] or [possible[1]]])
+
+    return result
+
+
+def time_selector_setup(results):
+    for case, questions in (("bank=questions.jsonl", QuestionBank()),
+                            ("bank=100000", load_table(make_bank_lines(100000)))):
+        selector = QuestionSelector(questions, random.Random(0))
+
+        results.append({"name": "selector_setup", "case": case, "time_us": best_time(selector.setup, REPEAT)})
+
+
+def time_grading(results):
+    questions = QuestionBank()
+    session = QuizSession(questions, random.Random(0))
+
+    # Starts quizzes until the first question is a checkbox one
+    while session.start("benchmark").question_type == 3:
+        pass
+
+    question = session.get_current_question()
+
+    # The bank doesn't have any keyboard input questions
+    typed_question = Question("Type the answer", 3, 1, ["Answer", "The answer"], [0, 1])
+    selected_mask = 1
+
+    # What submit_answer does for a checkbox question: colour every answer, then grade and record the selection
+    def submit_selection():
+        for answer_index in range(0, len(question.possible)):
+            grading.get_answer_colour(answer_index, selected_mask, question.correct_mask)
+
+        session.submit_selection(selected_mask)
+
+        session.results.pop()
+        session.answered = False
+
+    def submit_typed_answer():
+        grading.grade_typed_answer(typed_question, "Answer")
+
+    results.append({"name": "grading", "case": "selection", "time_us": best_time(submit_selection, REPEAT)})
+    results.append({"name": "grading", "case": "typed", "time_us": best_time(submit_typed_answer, REPEAT)})
+
+
+def time_serialisation(results):
+    for question_count in (16, 500):
+        result = make_result(question_count)
+        case = "questions=" + str(question_count)
+
+        json_data = json.dumps(result)
+        encoded_data = result_format.encode_result(result)
+
+        results.append({"name": "serialise_json", "case": case,
+                        "time_us": best_time(lambda: json.dumps(result), REPEAT)})
+        results.append({"name": "serialise_encoded", "case": case,
+                        "time_us": best_time(lambda: result_format.encode_result(result), REPEAT)})
+        results.append({"name": "deserialise_json", "case": case,
+                        "time_us": best_time(lambda: json.loads(json_data), REPEAT)})
+        results.append({"name": "deserialise_encoded", "case": case,
+                        "time_us": best_time(lambda: result_format.decode_result(encoded_data), REPEAT)})
+
+
+# Saves a lot of attempts for one user, one second apart (file names only go down to the second)
+def fill_store(store, attempt_count):
+    result = make_result(16)
+    start = datetime(2023, 1, 1)
+
+    for first in range(0, attempt_count, 1000):
+        store.save_results([("benchmark", start + timedelta(seconds=i), result)
+                            for i in range(first, min(first + 1000, attempt_count))])
+
+
+# What the summary selector does: count the attempts, then load the page that's scrolled to
+def list_page(store, page_number):
+    store.count_attempts("benchmark")
+
+    return store.list_attempts("benchmark", page_number * PAGE_SIZE, PAGE_SIZE)
+
+
+def time_listing(results):
+    for attempt_count in LISTING_SIZES:
+        main_path = tempfile.mkdtemp()
+
+        try:
+            file_store = FileResultsStore(main_path)
+            fill_store(file_store, attempt_count)
+
+            sqlite_store = SqliteResultsStore(os.path.join(main_path, "results.sqlite3"))
+            fill_store(sqlite_store, attempt_count)
+
+            case = "attempts=" + str(attempt_count)
+            last_page = (attempt_count - 1) // PAGE_SIZE
+
+            # The first time a folder is listed by a new version of the quiz, its index has to be built from the files
+            os.remove(os.path.join(file_store.get_user_path("benchmark"), "attempts.idx"))
+
+            results.append({"name": "list_file_index_rebuild", "case": case,
+                            "time_us": single_time(lambda: list_page(file_store, 0))})
+
+            for name, store in (("list_file", file_store), ("list_sqlite", sqlite_store)):
+                results.append({"name": name + "_first_page", "case": case,
+                                "time_us": best_time(lambda: list_page(store, 0), REPEAT)})
+                results.append({"name": name + "_last_page", "case": case,
+                                "time_us": best_time(lambda: list_page(store, last_page), REPEAT)})
+
+            sqlite_store.close()
+        finally:
+            shutil.rmtree(main_path)
+
+
+def time_open_summary(results):
+    main_path = tempfile.mkdtemp()
+
+    try:
+        file_store = FileResultsStore(main_path)
+        sqlite_store = SqliteResultsStore(os.path.join(main_path, "results.sqlite3"))
+
+        for question_count in (16, 500):
+            result = make_result(question_count)
+            case = "questions=" + str(question_count)
+
+            for name, store in (("open_summary_file", file_store), ("open_summary_sqlite", sqlite_store)):
+                attempt = store.save_result("benchmark", datetime(2023, 1, 1) + timedelta(seconds=question_count),
+                                            result)
+
+                # Opening the viewer only shows the first question
+                results.append({"name": name, "case": case,
+                                "time_us": best_time(lambda: store.open_result(attempt)[0], REPEAT)})
+
+        sqlite_store.close()
+    finally:
+        shutil.rmtree(main_path)
+
+
+# Stands in for a Tk widget when there's no display, so the TkObject bookkeeping can still be timed
+class HeadlessWidget:
+    def grid(self, **options):
+        pass
+
+    def grid_remove(self):
+        pass
+
+    def grid_columnconfigure(self, column, weight=0):
+        pass
+
+    def after_idle(self, function):
+        pass
+
+    def destroy(self):
+        pass
+
+
+def time_set_visible(results):
+    import main
+
+    try:
+        window = tkinter.Tk()
+        backend = "tk"
+
+        def make_widget():
+            return tkinter.Frame(window)
+    except tkinter.TclError:
+        window = HeadlessWidget()
+        backend = "headless"
+
+        make_widget = HeadlessWidget
+
+    scheduler = main.LayoutScheduler(window)
+    main.constants.layout_scheduler = scheduler
+
+    # A screen like the quiz screen, with a container of answer rows inside it
+    screen = main.TkObject(make_widget())
+    container = main.TkObject(make_widget(), parent=screen)
+    buttons = [main.TkObject(make_widget(), parent=screen, row=i + 1) for i in range(0, 4)]
+    rows = [main.TkObject(make_widget(), parent=container, row=i) for i in range(0, 100)]
+
+    scheduler.flush()
+
+    # What set_play_text does on a key press
+    def toggle_buttons():
+        buttons[0].set_visible(not buttons[0].visible)
+        buttons[1].set_visible(not buttons[1].visible)
+
+        scheduler.flush()
+
+    # Switching between the start screen and the quiz screen
+    def toggle_screen():
+        screen.set_visible(not screen.visible)
+
+        scheduler.flush()
+
+    results.append({"name": "set_visible_buttons", "case": backend, "time_us": best_time(toggle_buttons, REPEAT)})
+    results.append({"name": "set_visible_screen", "case": backend + " rows=" + str(len(rows)),
+                    "time_us": best_time(toggle_screen, REPEAT)})
+
+    if backend == "tk":
+        window.destroy()
+
+
+def run():
+    results = []
+
+    time_selector_setup(results)
+    time_grading(results)
+    time_serialisation(results)
+    time_listing(results)
+    time_open_summary(results)
+    time_set_visible(results)
+
+    return results
+
+
+if __name__ == '__main__':
+    json.dump(run(), sys.stdout, indent=2)
+    print()
@@ -0,0 +1,134 @@
+import json
+import os
+import random
+import tempfile
+import tracemalloc
+
+from question_bank import Question, QuestionBank, QuestionTable
+
+BANK_SIZES = (1000, 100000)
+
+# Answers are drawn from a shared vocabulary, like how many questions share answers such as years
+ANSWER_VOCABULARY_SIZE = 5000
+
+
+# The way Question used to be stored: a plain class with its own attribute dictionary and a correct list built up in a
+# loop
+class LegacyQuestion:
+    def __init__(self, question_text, question_type, answer_type, possible_answers, correct_answers):
+        self.question_text = question_text
+
+        self.question_type = question_type
+        self.answer_type = answer_type
+
+        self.possible = possible_answers
+
+        self.id = None
+
+        real_correct_answers = []
+        for answer_index in correct_answers:
+            real_correct_answers.append(possible_answers[answer_index])
+
+        self.correct = real_correct_answers
+
+
+# Makes a bank's worth of JSON question lines, the same as a question bank file
+def make_bank_lines(bank_size, seed=0):
+    rng = random.Random(seed)
+    vocabulary = ["Answer number " + str(i) for i in range(0, ANSWER_VOCABULARY_SIZE)]
+
+    lines = []
+    for i in range(0, bank_size):
+        possible = rng.sample(vocabulary, rng.randrange(4, 10))
+        correct = sorted(rng.sample(range(0, len(possible)), rng.randrange(1, 3)))
+
+        lines.append(json.dumps({"text": "What is the answer to question " + str(i) + "?", "question_type": 1,
+                                 "answer_type": 2, "possible": possible, "correct": correct}).encode("utf-8"))
+
+    return lines
+
+
+# Loads every line into a list of question objects of the given class
+def load_objects(lines, question_class):
+    questions = []
+
+    for line in lines:
+        data = json.loads(line)
+        questions.append(question_class(data["text"], data["question_type"], data["answer_type"], data["possible"],
+                                        data["correct"]))
+
+    return questions
+
+
+# Loads every line into a QuestionTable
+def load_table(lines):
+    table = QuestionTable()
+
+    for line in lines:
+        data = json.loads(line)
+        table.append(data["text"], data["question_type"], data["answer_type"], data["possible"], data["correct"])
+
+    return table
+
+
+# Measures how many bytes are still allocated by whatever the loader gives back
+def measure(loader):
+    tracemalloc.start()
+    result = loader()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    del result
+
+    return size
+
+
+# Measures how many bytes a QuestionBank holds for the lines, the way the quiz opens it. Small banks are read into a
+# QuestionTable, bigger ones only keep their index mapped from disk (which isn't counted, since it isn't Python memory)
+def measure_bank(lines):
+    with tempfile.TemporaryDirectory() as folder:
+        bank_path = os.path.join(folder, "bank.jsonl")
+
+        with open(bank_path, "wb") as bank_file:
+            bank_file.write(b"\n".join(lines) + b"\n")
+
+        # Opened once first, so compiling the index isn't measured
+        QuestionBank(bank_path).close()
+
+        tracemalloc.start()
+        bank = QuestionBank(bank_path)
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        bank.close()
+
+    return size
+
+
+def run():
+    results = []
+
+    for bank_size in BANK_SIZES:
+        lines = make_bank_lines(bank_size)
+
+        results.append({
+            "bank_size": bank_size,
+            "legacy_question_bytes": measure(lambda: load_objects(lines, LegacyQuestion)) / bank_size,
+            "slots_question_bytes": measure(lambda: load_objects(lines, Question)) / bank_size,
+            "question_table_bytes": measure(lambda: load_table(lines)) / bank_size,
+            "question_bank_bytes": measure_bank(lines) / bank_size
+        })
+
+    return results
+
+
+if __name__ == '__main__':
+    print("Memory per question (bytes)")
+    print("{:>10} {:>16} {:>16} {:>16} {:>16}".format("bank size", "old Question", "slots Question", "QuestionTable",
+                                                      "QuestionBank"))
+
+    for result in run():
+        print("{:>10} {:>16.0f} {:>16.0f} {:>16.0f} {:>16.1f}".format(
+            result["bank_size"], result["legacy_question_bytes"], result["slots_question_bytes"],
+            result["question_table_bytes"], result["question_bank_bytes"]))
+
@@ -0,0 +1,167 @@
+import gc
+import sys
+import tempfile
+import time
+import tkinter
+import tracemalloc
+
+from memory_profiling import MemoryProfiler, format_growth, take_snapshot
+
+# Plays quiz after quiz through the real GUI (opening and closing the summaries after each one), and fails if memory
+# keeps growing. Needs a display, since it opens the real window:
+#   python -m benchmarks.memory_soak [rounds]
+#
+# The first WARMUP_ROUNDS are played before anything's measured, since the first quiz loads the question bank, makes
+# the answer checkboxes and imports whatever fast start put off. After that, traced memory is measured after every
+# round, and a straight line is fitted through the sizes. If the line goes up by more than
+# ALLOWED_GROWTH_PER_ROUND_BYTES a round, something is being kept from every quiz: the call sites that grew are printed,
+# and the exit code is 1. The fitted line means one round that happens to free some memory doesn't hide a leak. Each
+# quiz takes about 3 seconds, since the quiz's own after delays (refer to play_game and switch_to_quiz in main.py) are
+# waited out
+
+ROUNDS = 10
+WARMUP_ROUNDS = 2
+
+# Some growth isn't a leak, like SQLite's caches filling up as results are saved
+ALLOWED_GROWTH_PER_ROUND_BYTES = 1024
+
+USERNAME = "soak"
+
+# The longest any one step is waited on (in seconds)
+TIMEOUT = 30
+
+
+# Runs the Tk event loop until a condition is true
+def wait_for(window, condition):
+    deadline = time.perf_counter() + TIMEOUT
+
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise RuntimeError("The quiz got stuck waiting for " + condition.__name__)
+
+        window.update()
+        time.sleep(0.005)
+
+
+# Gets the slope of the least squares line through the sizes (in bytes per round)
+def get_growth_slope(sizes):
+    mean_round = (len(sizes) - 1) / 2
+    mean_size = sum(sizes) / len(sizes)
+
+    spread = sum((i - mean_round) ** 2 for i in range(0, len(sizes)))
+
+    if not spread:
+        return 0.0
+
+    return sum((i - mean_round) * (size - mean_size) for i, size in enumerate(sizes)) / spread
+
+
+def play_quiz(main):
+    constants = main.constants
+    start_screen = constants.start_screen
+    quiz_screen = constants.quiz_screen
+
+    def quiz_started():
+        return constants.quiz_session and constants.quiz_session.username is not None
+
+    def result_saved():
+        return not constants.result_writer.is_busy()
+
+    def attempts_loaded():
+        return constants.summary_window_class.pages
+
+    start_screen.play_game()
+    wait_for(constants.window, quiz_started)
+
+    # Answers every question with its first answer (or some typed text)
+    while constants.playing:
+        if constants.quiz_session.get_current_question().question_type == 3:
+            quiz_screen.clear_entry_text()
+            quiz_screen.entry_text.set("soak")
+        else:
+            quiz_screen.answer_objects[0].checked.set(1)
+            quiz_screen.answer_objects[0].clicked()
+
+        quiz_screen.submit_answer()
+        quiz_screen.submit_answer()
+
+    wait_for(constants.window, result_saved)
+    constants.window.update()
+
+    start_screen.open_summaries()
+    wait_for(constants.window, attempts_loaded)
+
+    start_screen.close_summaries(True, False)
+    constants.window.update()
+
+
+def run(rounds=ROUNDS):
+    import main
+
+    main_path = tempfile.mkdtemp()
+    main.constants.main_path = main_path
+
+    profiler = MemoryProfiler()
+    profiler.start()
+
+    quiz = main.Quiz()
+
+    try:
+        start_screen = main.constants.start_screen
+
+        start_screen.focus_username()
+        start_screen.username_variable.set(USERNAME)
+
+        for i in range(0, WARMUP_ROUNDS):
+            play_quiz(main)
+
+        first_snapshot = take_snapshot()
+        sizes = [tracemalloc.get_traced_memory()[0]]
+
+        for i in range(0, rounds):
+            play_quiz(main)
+
+            gc.collect()
+            sizes.append(tracemalloc.get_traced_memory()[0])
+
+        last_snapshot = take_snapshot()
+    finally:
+        quiz.result_writer.close()
+        quiz.results_store.close()
+        quiz.destroy()
+
+    profiler.stop()
+
+    growth = sizes[-1] - sizes[0]
+    slope = get_growth_slope(sizes)
+    leaking = slope > ALLOWED_GROWTH_PER_ROUND_BYTES
+
+    if leaking:
+        print("Memory grew by " + format(slope / 1024, ".2f") + " KiB per quiz over " + str(rounds) + " quizzes:",
+              file=sys.stderr)
+
+        for line in format_growth(first_snapshot, last_snapshot):
+            print(line, file=sys.stderr)
+
+    return {
+        "rounds": rounds,
+        "leaking": leaking,
+        "growth_bytes": float(growth),
+        "growth_per_round_bytes": float(growth / rounds),
+        "growth_slope_bytes": float(slope)
+    }
+
+
+if __name__ == '__main__':
+    try:
+        result = run(len(sys.argv) > 1 and int(sys.argv[1]) or ROUNDS)
+    except tkinter.TclError as error:
+        print("This test needs a display: " + str(error))
+
+        sys.exit(1)
+
+    print("Memory growth over " + str(result["rounds"]) + " quizzes: " + format(result["growth_bytes"] / 1024, "+.1f") +
+          " KiB (" + format(result["growth_slope_bytes"] / 1024, "+.2f") + " KiB per quiz)")
+
+    if result["leaking"]:
+        sys.exit(1)
@@ -0,0 +1,66 @@
+import random
+import sys
+import timeit
+
+from sampling import UniqueIdSampler, sample_ids
+
+BANK_SIZES = (1000, 100000, 1000000)
+
+# The amount of questions a quiz draws (QuestionSelector draws between 12 and 16)
+QUIZ_LENGTH = 16
+
+
+# The way QuestionSelector used to draw questions: copy the whole bank, then random.choice and list.remove every draw
+def draw_by_choice_and_remove(bank, amount):
+    remaining = bank.copy()
+    drawn = []
+
+    for i in range(0, amount):
+        question = random.choice(remaining)
+        remaining.remove(question)
+
+        drawn.append(question)
+
+    return drawn
+
+
+# The way QuestionSelector draws questions now
+def draw_by_sampler(bank_size, amount):
+    sampler = UniqueIdSampler(bank_size)
+
+    return [sampler.draw() for i in range(0, amount)]
+
+
+# Times a function and gives back the best time of a run in microseconds
+def best_time(function, repeat):
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+
+    return min(timer.repeat(repeat, number)) / number * 1000000
+
+
+def run(repeat=5):
+    results = []
+
+    for bank_size in BANK_SIZES:
+        bank = list(range(0, bank_size))
+
+        results.append({
+            "bank_size": bank_size,
+            "choice_and_remove_us": best_time(lambda: draw_by_choice_and_remove(bank, QUIZ_LENGTH), repeat),
+            "unique_id_sampler_us": best_time(lambda: draw_by_sampler(bank_size, QUIZ_LENGTH), repeat),
+            "random_sample_us": best_time(lambda: sample_ids(bank_size, QUIZ_LENGTH), repeat)
+        })
+
+        del bank
+
+    return results
+
+
+if __name__ == '__main__':
+    print("Drawing " + str(QUIZ_LENGTH) + " unique questions (microseconds per quiz)")
+    print("{:>10} {:>18} {:>18} {:>18}".format("bank size", "choice + remove", "UniqueIdSampler", "random.sample"))
+
+    for result in run(int(sys.argv[1]) if len(sys.argv) > 1 else 5):
+        print("{:>10} {:>18.1f} {:>18.1f} {:>18.1f}".format(result["bank_size"], result["choice_and_remove_us"],
+                                                           result["unique_id_sampler_us"], result["random_sample_us"]))
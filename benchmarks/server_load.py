@@ -0,0 +1,128 @@
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+
+from quiz_server import QuizClient
+
+# Load tests the quiz server. The server runs in its own process (so it only gets one core), while lots of clients
+# play through quizzes against it at once.
+#   python -m benchmarks.server_load [clients] [seconds]
+
+DEFAULT_CLIENTS = 200
+DEFAULT_SECONDS = 10
+
+
+# Finds a free port for the server to use
+def get_free_port():
+    with socket.socket() as free_socket:
+        free_socket.bind(("127.0.0.1", 0))
+
+        return free_socket.getsockname()[1]
+
+
+# Starts the server process and waits until it accepts connections
+def start_server(port):
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    server = subprocess.Popen([sys.executable, os.path.join(root, "quiz_server.py"), "127.0.0.1", str(port)],
+                              stdout=subprocess.DEVNULL)
+
+    for i in range(0, 100):
+        try:
+            socket.create_connection(("127.0.0.1", port), 0.1).close()
+
+            return server
+        except OSError:
+            time.sleep(0.1)
+
+    server.kill()
+
+    raise RuntimeError("The quiz server didn't start")
+
+
+# Gets a percentile from an already sorted list
+def get_percentile(sorted_values, percentile):
+    if not sorted_values:
+        return 0
+
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * percentile / 100))]
+
+
+# Plays quizzes with random answers until the time runs out. Gives back how many quizzes were finished
+async def play_quizzes(port, end_time, submit_latencies, rng):
+    client = await QuizClient("127.0.0.1", port).connect()
+
+    finished = 0
+
+    while time.perf_counter() < end_time:
+        response = await client.start("load test")
+
+        while "question" in response:
+            question = response["question"]
+
+            if question["question_type"] == 3:
+                start = time.perf_counter()
+                await client.submit_typed("load test")
+            else:
+                answers = [rng.randrange(0, len(question["possible"]))]
+
+                start = time.perf_counter()
+                await client.submit(answers)
+
+            submit_latencies.append(time.perf_counter() - start)
+
+            response = await client.next()
+
+        finished += 1
+
+    await client.close()
+
+    return finished
+
+
+async def run_clients(port, clients, seconds):
+    submit_latencies = []
+
+    start = time.perf_counter()
+    end_time = start + seconds
+
+    finished = await asyncio.gather(*[play_quizzes(port, end_time, submit_latencies, random.Random(i))
+                                      for i in range(0, clients)])
+
+    elapsed = time.perf_counter() - start
+
+    submit_latencies.sort()
+
+    return {
+        "clients": clients,
+        "seconds": elapsed,
+        "sessions": sum(finished),
+        "sessions_per_second": sum(finished) / elapsed,
+        "submits": len(submit_latencies),
+        "submit_p50_ms": get_percentile(submit_latencies, 50) * 1000,
+        "submit_p99_ms": get_percentile(submit_latencies, 99) * 1000
+    }
+
+
+def run(clients=DEFAULT_CLIENTS, seconds=DEFAULT_SECONDS):
+    port = get_free_port()
+    server = start_server(port)
+
+    try:
+        return asyncio.run(run_clients(port, clients, seconds))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == '__main__':
+    result = run(len(sys.argv) > 1 and int(sys.argv[1]) or DEFAULT_CLIENTS,
+                 len(sys.argv) > 2 and float(sys.argv[2]) or DEFAULT_SECONDS)
+
+    print(str(result["clients"]) + " clients for " + format(result["seconds"], ".1f") + "s")
+    print(format(result["sessions_per_second"], ".1f") + " sessions/s (" + str(result["sessions"]) + " finished)")
+    print("submit latency: p50 " + format(result["submit_p50_ms"], ".2f") + "ms, p99 " +
+          format(result["submit_p99_ms"], ".2f") + "ms (" + str(result["submits"]) + " submits)")
@@ -0,0 +1,109 @@
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# Times how long the quiz takes to start, from importing main.py to the first frame of the main menu being drawn. Every
+# run is a new Python process, so nothing is already imported. Runs with fast start on and off (refer to fast_start in
+# main.py).
+#
+# How long importing main.py takes is timed on its own too (import_ms). The first frame needs a display, so without one
+# only the import is timed
+
+RUNS = 10
+
+# Runs in a new process and prints how long importing main.py took, then how long it took to get to the first frame
+# (in seconds). Results are saved to a temporary folder instead of the real one
+STARTUP_SCRIPT = """
+import sys
+import time
+
+start = time.perf_counter()
+
+import main
+
+print(time.perf_counter() - start, flush=True)
+
+main.constants.main_path = sys.argv[1]
+
+quiz = main.Quiz()
+quiz.update()
+
+print(time.perf_counter() - start)
+
+quiz.result_writer.close()
+quiz.results_store.close()
+quiz.destroy()
+"""
+
+REPOSITORY_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# Starts the quiz once and gives back how long importing main.py took and how long it took to show (in milliseconds).
+# The time to show is None if there's no display
+def time_startup(fast_start):
+    environment = dict(os.environ, QUIZ_FAST_START=fast_start and "1" or "0")
+
+    with tempfile.TemporaryDirectory() as main_path:
+        process = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT, main_path], cwd=REPOSITORY_PATH,
+                                 env=environment, capture_output=True, text=True)
+
+    times = [float(line) * 1000 for line in process.stdout.split() if line.replace(".", "", 1).isdigit()]
+
+    if process.returncode != 0:
+        error = process.stderr.strip().splitlines()[-1]
+
+        if not times or not error.startswith("_tkinter.TclError"):
+            raise RuntimeError(error)
+
+        return times[0], None
+
+    return times[0], times[-1]
+
+
+def run():
+    results = []
+
+    for fast_start in (False, True):
+        runs = [time_startup(fast_start) for i in range(0, RUNS)]
+
+        import_times = sorted(import_time for import_time, frame_time in runs)
+        frame_times = sorted(frame_time for import_time, frame_time in runs if frame_time is not None)
+
+        result = {
+            "fast_start": fast_start,
+            "runs": len(runs),
+            "import_min_ms": import_times[0],
+            "import_median_ms": statistics.median(import_times)
+        }
+
+        if frame_times:
+            result["min_ms"] = frame_times[0]
+            result["median_ms"] = statistics.median(frame_times)
+
+        results.append(result)
+
+    return results
+
+
+if __name__ == '__main__':
+    try:
+        results = run()
+    except RuntimeError as error:
+        print("Couldn't start the quiz (this benchmark needs a display): " + str(error))
+
+        sys.exit(1)
+
+    print("Startup (ms)")
+    print("{:>12} {:>12} {:>14} {:>12} {:>14}".format("fast start", "import min", "import median", "frame min",
+                                                      "frame median"))
+
+    for result in results:
+        print("{:>12} {:>12.1f} {:>14.1f} {:>12} {:>14}".format(
+            result["fast_start"] and "on" or "off", result["import_min_ms"], result["import_median_ms"],
+            "min_ms" in result and format(result["min_ms"], ".1f") or "-",
+            "median_ms" in result and format(result["median_ms"], ".1f") or "-"))
+
+    if "min_ms" not in results[0]:
+        print("There's no display, so only importing main.py was timed")
@@ -0,0 +1,140 @@
+import random
+import statistics
+import sys
+import time
+import tkinter
+
+from widget_pool import SummaryCheckButtonPool
+
+# Times pressing Next in the result summary, which changes the checkboxes to the next question's answers. Needs a
+# display, since it makes real Tk widgets (and waits for Tk to lay them out after every press)
+
+NAVIGATIONS = 500
+
+# Questions in the quiz have between 4 and 14 answers
+MIN_ANSWERS = 4
+MAX_ANSWERS = 14
+
+
+# Makes a result's worth of (checked, answer, colour) answers for every question
+def make_questions(amount, seed=0):
+    rng = random.Random(seed)
+    questions = []
+
+    for i in range(0, amount):
+        answer_count = rng.randrange(MIN_ANSWERS, MAX_ANSWERS + 1)
+        selected = rng.randrange(0, answer_count)
+
+        questions.append([(answer_index == selected, "Answer " + str(answer_index),
+                           answer_index == selected and "green" or "black") for answer_index in range(0, answer_count)])
+
+    return questions
+
+
+# The way the summary used to change questions: destroy every checkbox, make new ones, then pack the buttons again so
+# they end up below the new checkboxes
+class LegacySummary:
+    def __init__(self, window):
+        self.window = window
+
+        self.checkbuttons = []
+
+        self.next_button = tkinter.Button(window, text="Next")
+        self.back_button = tkinter.Button(window, text="Back")
+        self.result_label = tkinter.Label(window, text="Correct!")
+
+    def show(self, answers):
+        for checkbutton in self.checkbuttons:
+            checkbutton.destroy()
+
+        self.checkbuttons.clear()
+
+        for checked, answer, colour in answers:
+            checked_variable = tkinter.IntVar(self.window, checked and 1 or 0)
+
+            checkbutton = tkinter.Checkbutton(self.window, text=answer, variable=checked_variable)
+            checkbutton.config(fg=colour)
+            checkbutton.pack()
+
+            self.checkbuttons.append(checkbutton)
+
+        self.result_label.pack_forget()
+        self.next_button.pack_forget()
+        self.back_button.pack_forget()
+
+        self.next_button.pack()
+        self.back_button.pack()
+        self.result_label.pack()
+
+
+# The way the summary changes questions now
+class PooledSummary:
+    def __init__(self, window):
+        answer_frame = tkinter.Frame(window)
+        answer_frame.pack()
+
+        self.pool = SummaryCheckButtonPool(answer_frame)
+
+        tkinter.Button(window, text="Next").pack()
+        tkinter.Button(window, text="Back").pack()
+        tkinter.Label(window, text="Correct!").pack()
+
+    def show(self, answers):
+        self.pool.show(answers)
+
+
+# Presses Next over and over, and gives back how long each press took to show (in milliseconds)
+def time_navigation(summary_class, questions):
+    window = tkinter.Tk()
+    window.geometry("700x500")
+
+    summary = summary_class(window)
+    window.update()
+
+    times = []
+
+    for i in range(0, NAVIGATIONS):
+        start = time.perf_counter()
+
+        summary.show(questions[i % len(questions)])
+        window.update()
+
+        times.append((time.perf_counter() - start) * 1000)
+
+    window.destroy()
+
+    return times
+
+
+def run():
+    questions = make_questions(100)
+    results = []
+
+    for name, summary_class in (("legacy", LegacySummary), ("pooled", PooledSummary)):
+        times = sorted(time_navigation(summary_class, questions))
+
+        results.append({
+            "name": name,
+            "navigations": len(times),
+            "mean_ms": statistics.mean(times),
+            "p50_ms": times[len(times) // 2],
+            "p99_ms": times[int(len(times) * 0.99)]
+        })
+
+    return results
+
+
+if __name__ == '__main__':
+    try:
+        results = run()
+    except tkinter.TclError as error:
+        print("This benchmark needs a display: " + str(error))
+
+        sys.exit(1)
+
+    print("Summary navigation latency (ms per Next press)")
+    print("{:>8} {:>10} {:>10} {:>10}".format("", "mean", "p50", "p99"))
+
+    for result in results:
+        print("{:>8} {:>10.3f} {:>10.3f} {:>10.3f}".format(result["name"], result["mean_ms"], result["p50_ms"],
+                                                           result["p99_ms"]))
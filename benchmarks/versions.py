@@ -0,0 +1,282 @@
+import ast
+import json
+import os
+import random
+import re
+import sys
+import types
+
+from benchmarks.memory import load_objects, load_table, make_bank_lines, measure
+from benchmarks.sampling import best_time
+from question_bank import QuestionBank
+from quiz_engine import QuestionSelector
+
+# Runs the same workload against every old version of the quiz in versions/, and the current one, to find which
+# version a slowdown or memory increase came in with:
+#   python -m benchmarks.versions [--output results.json] [--plot versions.png]
+#
+# The old versions are whole Tk programs, so they're never imported or run. Only the parts that don't need a window
+# are taken out of each file (with ast) and run on their own:
+#   - the Question class
+#   - the question list from GameConstants.__init__
+#   - the QuestionSelector class
+# They're run with their own random (seeded, so every version picks the same way) and a constants object that only
+# holds the questions. Grading can't be taken out, since every old version does it inside QuizScreen.submit_answer
+# straight from the checkboxes, so it isn't measured here (refer to hot_paths.py for the current grading).
+#
+# Every version gets two cases: its own question list (bank=own), and the same made up bank of SHARED_BANK_SIZE
+# questions built with its own Question class (bank=shared), so code changes can be told apart from the question list
+# getting bigger. Versions that can't run (a syntax error, no question bank yet, or a broken one) are listed with the
+# reason instead.
+#
+# --plot needs matplotlib
+
+VERSIONS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "versions")
+
+SHARED_BANK_SIZE = 1000
+
+# How many times each timing is repeated (the best one is kept). Kept low, since there's a lot of versions
+REPEAT = 3
+
+
+# Sorts versions like 1.1.1 < 1.1.1b < 1.1.2
+def get_version_key(version):
+    numbers, suffix = re.match(r"([\d.]+)(.*)", version).groups()
+
+    return [int(number) for number in numbers.split(".")], suffix
+
+
+def list_versions():
+    versions = [file_name[:-3] for file_name in os.listdir(VERSIONS_PATH) if file_name.endswith(".py")]
+
+    return sorted(versions, key=get_version_key)
+
+
+# Finds the question list GameConstants.__init__ assigns to self.questions
+def find_question_list(class_node):
+    for node in ast.walk(class_node):
+        if isinstance(node, ast.Assign) and any(isinstance(target, ast.Attribute) and target.attr == "questions"
+                                                for target in node.targets):
+            return node.value
+
+
+# Takes the question bank and selector out of an old version, or raises ValueError if it doesn't have them
+class Snapshot:
+    def __init__(self, version):
+        self.version = version
+
+        path = os.path.join(VERSIONS_PATH, version + ".py")
+
+        with open(path, "r", encoding="utf-8") as source_file:
+            source = source_file.read()
+
+        try:
+            module_node = ast.parse(source, path)
+        except SyntaxError as error:
+            raise ValueError("syntax error on line " + str(error.lineno))
+
+        classes = {node.name: node for node in module_node.body if isinstance(node, ast.ClassDef)}
+
+        if "Question" not in classes or "GameConstants" not in classes:
+            raise ValueError("no question bank")
+
+        question_list = find_question_list(classes["GameConstants"])
+
+        if question_list is None:
+            raise ValueError("no question bank")
+
+        if "QuestionSelector" not in classes or not self.find_method(classes["QuestionSelector"], "setup"):
+            raise ValueError("no question selector")
+
+        self.selector_node = classes["QuestionSelector"]
+
+        # Everything the taken out code uses from the rest of the file. print is silenced, since old versions print
+        # when they run out of questions
+        self.constants = types.SimpleNamespace(questions=None)
+        self.namespace = {"constants": self.constants, "random": None, "print": lambda *arguments, **options: None}
+
+        self.run_code(ast.Module(body=[classes["Question"], self.selector_node], type_ignores=[]), path)
+        self.question_list_code = compile(ast.Expression(question_list), path, "eval")
+
+        # Some versions were saved with a question list that doesn't build
+        try:
+            self.build_questions()
+        except (TypeError, NameError, IndexError) as error:
+            raise ValueError("question list doesn't build: " + str(error))
+
+    @staticmethod
+    def find_method(class_node, name):
+        for node in class_node.body:
+            if isinstance(node, ast.FunctionDef) and node.name == name:
+                return node
+
+    def run_code(self, module_node, path):
+        exec(compile(module_node, path, "exec"), self.namespace)
+
+    def build_questions(self):
+        return eval(self.question_list_code, self.namespace)
+
+    def build_shared_questions(self, lines):
+        return load_objects(lines, self.namespace["Question"])
+
+    # Makes a selector for the given questions. Older selectors were given the window (or the GUI and the window),
+    # which they only kept a reference to
+    def create_selector(self, questions, rng):
+        self.constants.questions = questions
+        self.namespace["random"] = rng
+
+        selector_class = self.namespace["QuestionSelector"]
+        window = types.SimpleNamespace(gui=None)
+
+        argument_count = len(self.find_method(self.selector_node, "__init__").args.args)
+
+        if argument_count == 3:
+            return selector_class(None, window)
+        elif argument_count == 2:
+            return selector_class(window)
+
+        return selector_class()
+
+
+# The current version, set up the same way as a Snapshot
+class CurrentVersion:
+    version = "current"
+
+    @staticmethod
+    def build_questions():
+        return QuestionBank()
+
+    @staticmethod
+    def build_shared_questions(lines):
+        return load_table(lines)
+
+    @staticmethod
+    def create_selector(questions, rng):
+        return QuestionSelector(questions, rng)
+
+
+# One quiz from start to end, as far as the version's selector goes: pick the questions, go through every one of them,
+# then reset
+def play_quiz(selector):
+    selector.setup()
+
+    if hasattr(selector, "get_current_question"):
+        selector.get_current_question()
+
+    if hasattr(selector, "next_question"):
+        while selector.next_question() is not None:
+            selector.get_current_question()
+
+    if hasattr(selector, "reset"):
+        selector.reset()
+
+
+def measure_version(version, lines):
+    results = []
+
+    for case, build in (("own", version.build_questions), ("shared", lambda: version.build_shared_questions(lines))):
+        questions = build()
+        selector = version.create_selector(questions, random.Random(0))
+
+        results.append({
+            "version": version.version,
+            "case": "bank=" + case,
+            "questions": len(questions),
+            "bank_build_us": best_time(build, REPEAT),
+            "bank_bytes": float(measure(build)),
+            "play_quiz_us": best_time(lambda: play_quiz(selector), REPEAT)
+        })
+
+    return results
+
+
+def run():
+    lines = make_bank_lines(SHARED_BANK_SIZE)
+    results = []
+
+    for version_name in list_versions():
+        try:
+            version = Snapshot(version_name)
+        except ValueError as error:
+            results.append({"version": version_name, "error": str(error)})
+
+            continue
+
+        results.extend(measure_version(version, lines))
+
+    results.extend(measure_version(CurrentVersion, lines))
+
+    return results
+
+
+def print_table(results):
+    print("{:>8} {:>12} {:>10} {:>14} {:>12} {:>14}".format("version", "bank", "questions", "bank build us",
+                                                             "bank KiB", "play quiz us"))
+
+    for result in results:
+        if "error" in result:
+            print("{:>8} {:>12} ({})".format(result["version"], "-", result["error"]))
+
+            continue
+
+        print("{:>8} {:>12} {:>10} {:>14.1f} {:>12.1f} {:>14.1f}".format(result["version"], result["case"],
+                                                                         result["questions"], result["bank_build_us"],
+                                                                         result["bank_bytes"] / 1024,
+                                                                         result["play_quiz_us"]))
+
+
+# Plots every measurement of the shared bank case across versions
+def save_plot(results, plot_path):
+    import matplotlib
+    matplotlib.use("Agg")
+    from matplotlib import pyplot
+
+    shared_results = [result for result in results if result.get("case") == "bank=shared"]
+    versions = [result["version"] for result in shared_results]
+
+    figure, axes = pyplot.subplots(3, 1, sharex=True, figsize=(12, 9))
+
+    for axis, field, label in zip(axes, ("bank_build_us", "bank_bytes", "play_quiz_us"),
+                                  ("bank build (us)", "bank size (bytes)", "play quiz (us)")):
+        axis.plot(versions, [result[field] for result in shared_results], marker="o")
+        axis.set_ylabel(label)
+
+    axes[-1].tick_params(axis="x", rotation=90)
+    figure.suptitle(str(SHARED_BANK_SIZE) + " question bank")
+    figure.tight_layout()
+    figure.savefig(plot_path)
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+
+    output_path = None
+    plot_path = None
+
+    while arguments:
+        argument = arguments.pop(0)
+
+        if argument == "--output":
+            output_path = arguments.pop(0)
+        elif argument == "--plot":
+            plot_path = arguments.pop(0)
+        else:
+            print("Unknown argument " + argument, file=sys.stderr)
+
+            sys.exit(2)
+
+    results = run()
+
+    print_table(results)
+
+    if output_path:
+        with open(output_path, "w") as output:
+            json.dump(results, output, indent=2)
+
+    if plot_path:
+        try:
+            save_plot(results, plot_path)
+        except ImportError:
+            print("Couldn't save the plot, matplotlib isn't installed", file=sys.stderr)
+
+            sys.exit(1)
@@ -0,0 +1,81 @@
+# Grades answers to questions. Both the selected answers and the correct answers of a question are bitmasks over the
+# question's possible answers (bit n is answer n), so grading a submission is only a few integer operations
+
+# Answer types (refer to question_bank.py)
+ALL_ANSWERS = 1
+ONE_ANSWER = 2
+MORE_THAN_ONE_ANSWER = 3
+
+CORRECT_COLOUR = "green"
+MISSED_COLOUR = "orange"
+WRONG_COLOUR = "red"
+
+
+# Turns a list of answer strings into a bitmask over the possible answers. Answers that aren't possible are ignored
+def get_answers_mask(possible_answers, answers):
+    mask = 0
+    for answer_index in range(0, len(possible_answers)):
+        if possible_answers[answer_index] in answers:
+            mask |= 1 << answer_index
+
+    return mask
+
+
+# Turns a bitmask back into the list of answer strings it holds
+def get_mask_answers(possible_answers, mask):
+    return [possible_answers[answer_index] for answer_index in range(0, len(possible_answers))
+            if mask >> answer_index & 1]
+
+
+# Decides whether a selection is correct for the question's answer type
+def is_selection_correct(selected_mask, correct_mask, answer_type):
+    # Any selected answer that isn't correct fails the question straight away
+    if selected_mask & ~correct_mask:
+        return False
+
+    correct_count = (selected_mask & correct_mask).bit_count()
+
+    if answer_type == ALL_ANSWERS:
+        return correct_count == correct_mask.bit_count()
+    elif answer_type == ONE_ANSWER:
+        return correct_count >= 1
+    elif answer_type == MORE_THAN_ONE_ANSWER:
+        return correct_count > 1
+
+    return False
+
+
+# Gets the bitmask of correct answers that weren't selected (these show up orange)
+def get_missed_mask(selected_mask, correct_mask):
+    return correct_mask & ~selected_mask
+
+
+# Gets the colour an answer should be shown in after it's been graded
+def get_answer_colour(answer_index, selected_mask, correct_mask):
+    bit = 1 << answer_index
+
+    if not (selected_mask ^ correct_mask) & bit:
+        return CORRECT_COLOUR
+    elif correct_mask & bit:
+        return MISSED_COLOUR
+
+    return WRONG_COLOUR
+
+
+# Gets the selection bitmask for a typed answer. A typed answer that isn't one of the possible answers gets a bit past
+# the end of the possible answers, which makes it count as a wrong answer
+def get_typed_answer_mask(possible_answers, typed_answer):
+    if typed_answer in possible_answers:
+        return 1 << possible_answers.index(typed_answer)
+
+    return 1 << len(possible_answers)
+
+
+# Grades a question from a selection bitmask
+def grade_question(question, selected_mask):
+    return is_selection_correct(selected_mask, question.correct_mask, question.answer_type)
+
+
+# Grades a question from the text the user typed in
+def grade_typed_answer(question, typed_answer):
+    return grade_question(question, get_typed_answer_mask(question.possible, typed_answer))
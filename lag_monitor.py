@@ -0,0 +1,109 @@
+import sys
+import threading
+import time
+import traceback
+
+import metrics
+
+# Watches for the Tk event loop being blocked. Everything in the quiz (after callbacks, key presses, saving, loading)
+# runs on the main loop, so anything slow on it freezes the window.
+#
+# A heartbeat is scheduled with after every INTERVAL_MS, and how late it runs is its lag (how long the loop was busy
+# with something else). Lag is sent to the metrics sink as event_loop_lag when metrics are on (refer to metrics.py).
+#
+# A sampler thread checks how late the next heartbeat is. Once it's later than the threshold the loop is stalled, and
+# the sampler takes the main thread's stack until it isn't. When the heartbeat finally runs the stall is printed along
+# with every stack it caught, so it's clear what code was blocking the window
+
+
+class LagMonitor:
+    INTERVAL_MS = 100
+
+    # How often the sampler checks for a stall
+    SAMPLE_INTERVAL_MS = 20
+
+    def __init__(self, window, threshold_ms=200):
+        self.window = window
+        self.threshold = threshold_ms / 1000
+
+        self.main_thread_id = threading.get_ident()
+
+        self.heartbeat_id = None
+        self.expected_time = None
+
+        # Stack text -> how many times it was caught during the current stall
+        self.stack_samples = {}
+        self.samples_lock = threading.Lock()
+
+        self.beat_count = 0
+        self.max_lag = 0.0
+        self.stall_count = 0
+
+        self.stopped = threading.Event()
+        self.sampler = threading.Thread(target=self.sample, name="LagMonitor", daemon=True)
+
+    def start(self):
+        self.schedule_heartbeat()
+        self.sampler.start()
+
+    def schedule_heartbeat(self):
+        self.expected_time = time.perf_counter() + self.INTERVAL_MS / 1000
+        self.heartbeat_id = self.window.after(self.INTERVAL_MS, self.heartbeat)
+
+    def heartbeat(self):
+        lag = max(time.perf_counter() - self.expected_time, 0.0)
+
+        # The next heartbeat is scheduled first, so the sampler doesn't count printing the stall as part of it
+        self.schedule_heartbeat()
+
+        self.beat_count += 1
+        self.max_lag = max(self.max_lag, lag)
+
+        if metrics.sink:
+            metrics.sink.record("event_loop_lag", lag)
+
+        if lag >= self.threshold:
+            self.report_stall(lag)
+
+    # Prints a stall and the stacks caught during it, the most caught first
+    def report_stall(self, lag):
+        with self.samples_lock:
+            stack_samples = self.stack_samples
+            self.stack_samples = {}
+
+        self.stall_count += 1
+
+        print("Event loop blocked for " + format(lag * 1000, ".0f") + "ms (" + str(sum(stack_samples.values())) +
+              " stack samples)")
+
+        for stack, count in sorted(stack_samples.items(), key=lambda item: item[1], reverse=True):
+            print("  " + str(count) + "x:")
+            print(stack.rstrip("\n"))
+
+    # The sampler thread
+    def sample(self):
+        while not self.stopped.wait(self.SAMPLE_INTERVAL_MS / 1000):
+            if time.perf_counter() - self.expected_time < self.threshold:
+                continue
+
+            frame = sys._current_frames().get(self.main_thread_id)
+
+            if frame is None:
+                continue
+
+            stack = "".join(traceback.format_stack(frame))
+            del frame
+
+            with self.samples_lock:
+                self.stack_samples[stack] = self.stack_samples.get(stack, 0) + 1
+
+    # Stops the heartbeat and the sampler, and prints how laggy the loop was overall
+    def stop(self):
+        self.stopped.set()
+
+        if self.heartbeat_id:
+            self.window.after_cancel(self.heartbeat_id)
+            self.heartbeat_id = None
+
+        print("Event loop: " + str(self.beat_count) + " heartbeats, longest lag " + format(self.max_lag * 1000, ".0f")
+              + "ms, " + str(self.stall_count) + " stalls over " + format(self.threshold * 1000, ".0f") + "ms")
@@ -1,280 +1,69 @@
-import json
+import grading
+import itertools
+import metrics
 import os
 import platformdirs
-import random
 import tkinter
-import messagebox
-from datetime import datetime
+from datetime import datetime, timedelta
+from result_writer import ResultWriter
+from results_store import (DATABASE_FILE_NAME, SAV_IMPORT_KEY, FileResultsStore, SavImport, SqliteResultsStore,
+                           UsernameCache)
 
-
-# The class I use for storing question data
-class Question:
-    def __init__(self, question_text, question_type, answer_type, possible_answers, correct_answers):
-        self.question_text = question_text
-
-        self.question_type = question_type
-        self.answer_type = answer_type
-
-        self.possible = possible_answers
-
-        self.id = None
-
-        real_correct_answers = []
-        for answer_index in correct_answers:
-            real_correct_answers.append(possible_answers[answer_index])
-
-        self.correct = real_correct_answers
+# Modules that are only needed once the quiz is being played, a summary is opened or a message box is shown (messagebox,
+# question_bank, quiz_engine, attempt_loader and widget_pool) are imported when they're first used, so the window shows
+# up sooner
 
 
 # The class I use for storing variables that I need to use globally across the quiz
 class GameConstants:
     def __init__(self):
-        # My list of questions (refer to comments to see how the answers work)
         self.default_quiz_values = None
-        self.questions = [
-            Question(
-                "How tall is Mount Everest?",  # Question text
-                1,  # Question type (1 for single choice, 2 for multi choice, 3 for keyboard input)
-                2,  # Answer type (1 for all answers need to be correct, 2 for one answer, 3 for more than one answer)
-                # Possible answers (for keyboard input answers):
-                ["9,046 metres", "26,435 feet", "8,849 metres", "7,846 metres", "29,032 feet", "6,124 metres"],
-                [2, 4]  # Correct answers (indexes of correct answers)
-            ),
-            Question(
-                "Who is the current monarch? (as of May 2023)",
-                1,
-                2,
-                ["Queen Elizabeth II", "Queen Victoria", "King Charles III", "King William IV", "King Edward VIII"],
-                [2]
-            ),
-            Question(
-                "What is the deepest point on Earth?",
-                1,
-                2,
-                ["The Dead Sea", "Puerto Rico Trench", "Japan Trench", "Marianna Trench", "Izu-Ogasawara Trench",
-                 "Philipine Trench"],
-                [3]
-            ),
-            Question(
-                "What is the capital city of Australia?",
-                1,
-                2,
-                ["Melbourne", "Canberra", "Sydney", "Perth", "Darwin", "Adelaide", "Brisbane", "Gold Coast"],
-                [1]
-            ),
-            Question(
-                "When did WWII end?",
-                1,
-                2,
-                ["1941", "1939", "1946", "1945", "1942", "1944", "1943"],
-                [3]
-            ),
-            Question(
-                "What is the chemical symbol for gold?",
-                1,
-                2,
-                ["Gl", "Go", "Gd", "Kd", "Au", "Ae", "Ud", "H", "K", "Gold", "N", "A", "As", "G"],
-                [4]
-            ),
-            Question(
-                "Who is credited for the theory of relativity?",
-                1,
-                2,
-                ["Isaac Newton", "Rosalind Franklin", "Jane Goodall", "Marie Curie", "Nikola Tesla", "Albert Einstein",
-                 "Ernest Rutherford", "Charles Darwin"],
-                [5]
-            ),
-            Question(
-                "What is the largest internal organ in the human body?",
-                1,
-                2,
-                ["Liver", "Lungs", "Heart", "Kidneys", "Intestines", "Brain"],
-                [0]
-            ),
-            Question(
-                "Who painted the Mona Lisa?",
-                1,
-                2,
-                ["Michelangelo", "Leonardo Da Vinci", "El Greco", "Bellini", "Titian"],
-                [1]
-            ),
-            Question(
-                "What country is named 'land of the rising sun'?",
-                1,
-                2,
-                ["Vietnam", "Australia", "China", "Canada", "North Korea", "Japan", "Thailand", "Mexico", "Spain"],
-                [5]
-            ),
-            Question(
-                "What is the bestselling game of all time? (as of May 2023)",
-                1,
-                2,
-                ["Grand Theft Auto V", "Skyrim", "Minecraft", "Roblox", "Superhot", "Beat Saber", "Terraria", "Tetris",
-                 "Super Mario Bros."],
-                [2]
-            ),
-            Question(
-                "What is the current estimated population of the world? (as of May 2023)",
-                1,
-                2,
-                ["7,000,000,000", "8,000,000,000", "6,000,000,000", "7,500,000,000", "8,500,000,000", "6,500,000,000"],
-                [1]
-            ),
-            Question(
-                "When was the first Anzac Day?",
-                1,
-                2,
-                ["April 25th 1916", "April 22nd 1914", "April 25th 1917", "April 29th 1916", "April 25th 1915"],
-                [0]
-            ),
-            Question(
-                "What year was Google (the company) established?",
-                1,
-                2,
-                ["1997", "1999", "1996", "1998", "2000", "1993", "1995", "2002"],
-                [3]
-            ),
-            Question(
-                "When was the first cloned animal successfully created?",
-                1,
-                2,
-                ["1995", "1996", "2004", "Never", "1987", "1998", "2012", "2016", "1979"],
-                [1]
-            ),
-            Question(
-                "What year was New Zealand given its independence?",
-                1,
-                2,
-                ["1943", "1845", "1956", "1932", "1946", "1947", "1949"],
-                [5]
-            ),
-            Question(
-                "What planets are in our solar system?",
-                2,
-                1,
-                ["Pluto", "Mercury", "Mars", "Uranus", "Betelgeuse", "Earth", "The sun", "Titan"],
-                [1, 2, 3, 5]
-            ),
-            Question(
-                "How do you pronounce GIF?",
-                2,
-                2,
-                ["GIF (hard G)", "JIF (soft G)", "Guilt", "Franchise", "Horror"],
-                [0, 1]
-            ),
-            Question(
-                "What is the correct use of a semicolon? (;)",
-                1,
-                2,
-                ["To join two related independent clauses together", "To have a break in a sentence",
-                 "The same as a comma", "It doesn't exist"],
-                [0]
-            ),
-            Question(
-                "How many countries are recognised by the United Nations? (as of May 2023)",
-                1,
-                2,
-                ["195", "194", "189", "174", "201", "193", "205", "199"],
-                [5]
-            ),
-            Question(
-                "How many states are in the United States? (as of May 2023)",
-                1,
-                2,
-                ["50", "48", "51", "49", "47", "52"],
-                [0]
-            ),
-            Question(
-                "Who was the president of the United States in 1894?",
-                1,
-                2,
-                ["Abraham Lincoln", "Barack Obama", "Franklin D. Roosevelt", "Grover Cleveland", "George Washington",
-                 "Donald Trump", "John F. Kennedy"],
-                [3]
-            ),
-            Question(
-                "What is the highest grossing film as of May 2023?",
-                1,
-                2,
-                ["Avengers: Endgame", "Minions", "Avengers: Infinity-War", "Titanic", "Avatar", "Frozen",
-                 "The Lion King"],
-                [4]
-            ),
-            Question(
-                "What year did the first humans land on the Moon?",
-                1,
-                2,
-                ["1963", "1959", "1964", "1969", "1971", "1968", "1936"],
-                [3]
-            ),
-            Question(
-                "How old was Stephen Hawking when he died?",
-                1,
-                2,
-                ["75", "77", "74", "73", "78", "76"],
-                [5]
-            ),
-            Question(
-                "Which is the correct spelling?",
-                1,
-                2,
-                ["Antidisestablishmentanism", "Antidisestalbishmentariansism", "Antidisestabmentarian",
-                 "Antidisestablishmentarianism", "Antidisastablishmentarianism", "Antidisestablishingmentarianism"],
-                [3]
-            ),
-            Question(
-                "When was ChatGPT released to the public for testing?",
-                1,
-                2,
-                ["October 2022", "December 2022", "January 2023", "November 2022", "September 2022"],
-                [3]
-            ),
-            Question(
-                "Which of these VR headsets is the oldest?",
-                1,
-                2,
-                ["Valve Index", "Oculus Quest 1", "Oculus Rift", "Sony PlayStation VR 1", "HTC Vive"],
-                [2]
-            ),
-            Question(
-                "What was the first YouTube channel to hit 100,000,000 subscribers?",
-                1,
-                2,
-                ["PewDiePie", "T-Series", "Cocomelon", "MrBeast", "All of the above", "None of the above"],
-                [1]
-            ),
-            Question(
-                "What is the best tier of marble run?",
-                1,
-                2,
-                ["Tier 11 marble run", "Tier 13 marble run", "Tier 9 marble run", "Marble run tier 13",
-                 "Tier 15 marble run"],
-                [1]
-            )
-        ]
-
-        print("There are currently " + str(len(self.questions)) + " questions!")
-
-        # Give the questions unique IDs
-        for i in range(0, len(self.questions)):
-            self.questions[i].id = i
+
+        # The question bank, which is loaded the first time it's needed (refer to get_questions)
+        self.questions = None
+
+        # Whether to put off loading the question bank and the quiz session until the first quiz starts. Setting
+        # QUIZ_FAST_START=0 loads them at startup instead
+        self.fast_start = os.environ.get("QUIZ_FAST_START", "1") != "0"
+
+        # How long the window can freeze for before the lag monitor prints what was blocking it, in milliseconds. The
+        # monitor only runs when QUIZ_LAG_MONITOR is set to a threshold (refer to lag_monitor.py)
+        self.lag_threshold_ms = float(os.environ.get("QUIZ_LAG_MONITOR", "0"))
+
+        # Whether to trace memory and print what grew between quizzes, set with QUIZ_MEMORY_PROFILE=1 (refer to
+        # memory_profiling.py)
+        self.memory_profile = os.environ.get("QUIZ_MEMORY_PROFILE", "0") != "0"
+        self.memory_profiler = None
 
         # Variables that I use across the code
         self.playing = False
         self.username = None
 
-        self.tk_objects = []
+        # Every TkObject by its ID. IDs only ever go up, so they're never reused after an object is destroyed
+        self.tk_objects = {}
+        self.tk_object_ids = itertools.count()
+
+        # Applies TkObject visibility changes (refer to LayoutScheduler)
+        self.layout_scheduler = None
 
         # Directory for saved results
         self.main_path = platformdirs.user_data_dir("AnF2023Quiz", "FHSAnF")
 
+        # How results are saved, "sqlite" for one database or "file" for the old .sav files (refer to results_store.py)
+        self.results_backend = "sqlite"
+
         self.in_summary = False
 
         # Useful GUI variables
         self.gui = None
         self.quiz_screen = None
         self.start_screen = None
-        self.question_selector = None
+        self.quiz_session = None
+        self.results_store = None
+        self.result_writer = None
+
+        # Which users have saved results (refer to UsernameCache in results_store.py)
+        self.usernames = None
         self.window = None
 
         self.summary_window = None
@@ -291,6 +80,19 @@ class GameConstants:
 constants = GameConstants()
 
 
+# Gets the question bank, loading it if it hasn't been loaded yet (refer to question_bank.py to see how the bank files
+# work)
+def get_questions():
+    if constants.questions is None:
+        from question_bank import QuestionBank
+
+        constants.questions = QuestionBank()
+
+        print("There are currently " + str(len(constants.questions)) + " questions!")
+
+    return constants.questions
+
+
 # Used for creating a folder at a specified path if it doesn't already exist
 def create_folder_at_path(path):
     if not os.path.isdir(path):
@@ -302,8 +104,18 @@ def create_folder_at_path(path):
     print("Folder at " + path + " already exists")
 
 
+# Takes a memory snapshot for a quiz or summary event, if memory profiling is on
+def snapshot_memory(event):
+    if constants.memory_profiler:
+        constants.memory_profiler.snapshot(event)
+
+
 # Destroys the current summary window and any related objects
 def destroy_summary_window():
+    # Stops any attempts still being loaded for the summary selector before its window goes
+    if constants.summary_window_class:
+        constants.summary_window_class.cancel_loading()
+
     if constants.summary_window:
         constants.summary_window.destroy()
         constants.summary_window = None
@@ -313,18 +125,59 @@ def destroy_summary_window():
         constants.summary_window_class = None
 
 
+# Batches up TkObject visibility changes. set_visible only marks an object as dirty, and every dirty object gets gridded
+# or removed in one pass once Tk is idle (before it draws anything). However many times something is shown or hidden
+# during an interaction, each object is only laid out once, and only objects that actually changed are touched
+class LayoutScheduler:
+    def __init__(self, window):
+        self.window = window
+
+        # ID -> TkObject, for every object that needs laying out
+        self.dirty = {}
+
+        self.scheduled = False
+
+    def mark_dirty(self, tk_object):
+        self.dirty[tk_object.id] = tk_object
+
+        if not self.scheduled:
+            self.scheduled = True
+
+            self.window.after_idle(self.flush)
+
+    # Forgets about an object that's being destroyed
+    def discard(self, tk_object):
+        self.dirty.pop(tk_object.id, None)
+
+    # Lays out every dirty object. Parents go before their children, since whether a child is shown depends on them
+    def flush(self):
+        self.scheduled = False
+
+        while self.dirty:
+            self.update(self.dirty.popitem()[1])
+
+    def update(self, tk_object):
+        parent = tk_object.parent
+
+        if parent and parent.id in self.dirty:
+            self.update(self.dirty.pop(parent.id))
+
+        tk_object.update_layout()
+
+
 # A custom TK object class that I use to create my GUI objects. It just makes it easier for me to do certain things
 class TkObject:
     def __init__(self, object: tkinter.Label | tkinter.Frame | tkinter.Entry | tkinter.Button | tkinter.Checkbutton |
                                tkinter.Scrollbar | tkinter.Text,
                  visible=True, parent=None, column=0, row=0, padx=0, pady=0, side="top", sticky=""):
         self.object = object
-        self.id = len(constants.tk_objects)
-        constants.tk_objects.append(self)
+        self.id = next(constants.tk_object_ids)
+        constants.tk_objects[self.id] = self
 
         self.parent = None
 
-        self.children = []
+        # Child ID -> child, so children can be added and removed without searching for them
+        self.children = {}
 
         self.column = column
         self.row = row
@@ -338,7 +191,10 @@ class TkObject:
 
         self.visible = visible
 
-        self.current_row = 0
+        # Whether the object is actually gridded right now (it's only shown when its parents are all visible too), and
+        # the grid options it was gridded with
+        self.shown = False
+        self.grid_options = None
 
         if parent:
             self.set_parent(parent)
@@ -347,52 +203,49 @@ class TkObject:
 
     def set_parent(self, parent):
         if self.parent:
-            if self in parent.children:
-                parent.children.remove(self)
+            self.parent.children.pop(self.id, None)
 
         if parent:
             self.parent = parent
 
-            parent.children.append(self)
+            parent.children[self.id] = self
+
+            constants.layout_scheduler.mark_dirty(self)
 
         return self
 
-    # Sets the visibility (optionally anchor and whether it's just updating the visibility or actually setting it)
-    def set_visible(self, visible, *args):
-        if len(args) == 0 or not args[0]:
-            self.visible = visible
+    # Sets the visibility. The object is actually shown or hidden in the next layout pass (refer to LayoutScheduler)
+    def set_visible(self, visible):
+        self.visible = visible
 
-        override_invisible = False
-        current_parent = self
-        while True:
-            current_parent = current_parent.parent
-            if not current_parent:
-                break
+        constants.layout_scheduler.mark_dirty(self)
 
-            if not current_parent.visible:
-                override_invisible = True
-                break
+        return self
 
-        if visible and not override_invisible:
-            use_parent_row = False and self.parent and self.row == 0
+    # Grids or removes the object to match its visibility. Its children only get updated if it went from shown to
+    # hidden or the other way around
+    def update_layout(self):
+        shown = self.visible and (not self.parent or self.parent.shown)
 
-            self.object.grid(row=use_parent_row and self.parent.current_row or self.row, column=self.column,
-                             padx=self.padx, pady=self.pady, sticky=self.sticky)
+        if shown:
+            grid_options = (self.row, self.column, self.padx, self.pady, self.sticky)
 
-            self.object.grid_columnconfigure(1, weight=1)
+            if not self.shown or grid_options != self.grid_options:
+                self.object.grid(row=self.row, column=self.column, padx=self.padx, pady=self.pady, sticky=self.sticky)
 
-            if use_parent_row:
-                self.parent.current_row += 1
-        else:
+                self.object.grid_columnconfigure(1, weight=1)
+
+                self.grid_options = grid_options
+        elif self.shown:
             self.object.grid_remove()
 
-            if self.parent and self.row != 0:
-                self.parent.current_row -= 1
+        if shown == self.shown:
+            return
 
-        for child in self.children:
-            child.set_visible(visible and child.visible, True)
+        self.shown = shown
 
-        return self
+        for child in self.children.values():
+            child.update_layout()
 
     # Used for running functions after a certain amount of time
     def after(self, time_ms, function):
@@ -400,8 +253,8 @@ class TkObject:
 
     # Used for destroying all children of the object
     def clear_children(self):
-        for i in range(0, len(self.children)):
-            self.children[0].destroy()
+        for child in list(self.children.values()):
+            child.destroy()
 
     # Used for destroying the object itself. I try to destroy all known traces of the object here
     def destroy(self):
@@ -409,50 +262,149 @@ class TkObject:
 
         self.object.destroy()
 
-        constants.tk_objects.remove(self)
+        constants.tk_objects.pop(self.id, None)
+        constants.layout_scheduler.discard(self)
 
-        self.parent.children.remove(self)
+        if self.parent:
+            self.parent.children.pop(self.id, None)
 
         del self.object
         del self
 
 
-# Similar to the AnswerObject class. Used for the result summary checkboxes to keep track of their saved answers
-class SummaryCheckButton:
-    def __init__(self, checked, answer, colour):
-        self.checked_num = checked and 1 or 0
-        self.checked = tkinter.IntVar(constants.summary_window, self.checked_num)
+# A list that only has widgets for the rows that can actually be seen. Scrolling doesn't create or destroy anything, it
+# just changes what the same row widgets show, so the list costs the same no matter how many rows it has
+class VirtualList:
+    def __init__(self, parent, visible_rows, create_row, update_row):
+        self.frame = tkinter.Frame(parent)
+        self.scrollbar = tkinter.Scrollbar(parent, orient="vertical", command=self.on_scroll)
 
-        self.object = tkinter.Checkbutton(constants.summary_window, text=answer, command=self.clicked,
-                                          variable=self.checked)
-        self.object.config(fg=colour)
+        self.visible_rows = visible_rows
 
-    def clicked(self):
-        self.checked.set(self.checked_num)
+        # update_row(row, index) shows row number index in a row widget, or hides the widget if index is None
+        self.update_row = update_row
+        self.rows = [create_row(self.frame, i) for i in range(0, visible_rows)]
+
+        self.first_row = 0
+        self.row_count = 0
+
+    # Sets how many rows there are and goes back to the top
+    def set_row_count(self, row_count):
+        self.row_count = row_count
+        self.scroll_to(0)
+
+    # Cuts the list down to row_count rows, staying where it's scrolled to (as far as it can)
+    def shrink_row_count(self, row_count):
+        self.row_count = min(self.row_count, row_count)
+        self.scroll_to(self.first_row)
+
+    # Scrolls so that a row is at the top (as far as it can go)
+    def scroll_to(self, first_row):
+        self.first_row = max(0, min(first_row, self.row_count - self.visible_rows))
+
+        self.refresh()
+
+    # Updates every row widget to show what's currently scrolled to
+    def refresh(self):
+        for i in range(0, self.visible_rows):
+            index = self.first_row + i
+
+            if index >= self.row_count:
+                index = None
+
+            self.update_row(self.rows[i], index)
+
+        if self.row_count == 0:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.first_row / self.row_count,
+                               min(1, (self.first_row + self.visible_rows) / self.row_count))
+
+    # Called by the scrollbar, either ("moveto", fraction) or ("scroll", amount, "units"/"pages")
+    def on_scroll(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * self.row_count))
+        elif unit == "pages":
+            self.scroll_to(self.first_row + int(amount) * self.visible_rows)
+        else:
+            self.scroll_to(self.first_row + int(amount))
+
+    # Scrolls with the mouse wheel (delta on Windows/macOS, buttons 4 and 5 on Linux)
+    def on_mouse_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.first_row - 1)
+        elif event.num == 5 or event.delta < 0:
+            self.scroll_to(self.first_row + 1)
 
+    def pack(self):
+        self.frame.pack(side="left", fill="both", expand=True)
+        self.scrollbar.pack(side="right", fill="y")
 
-# Similar to the SummaryCheckButton and AnswerObject classes. Used for storing local variables for the summary
-# selector buttons
+
+# Similar to the SummaryCheckButton and AnswerObject classes. One row of the summary selector list, which gets reused
+# for whichever attempt is scrolled to it
 class SummaryScrollObject:
-    def __init__(self, file, file_name, scroller):
-        self.file_path = str(file.path)
-        self.file_name = file_name
+    def __init__(self, parent, row, scroller):
+        self.attempt = None
+        self.file_name = None
+
+        self.option = tkinter.Button(parent, command=lambda: self.open(scroller))
+        self.option.grid(row=row, column=0)
+
+    def open(self, scroller):
+        if self.attempt:
+            constants.start_screen.open_summary_attempt(scroller.username, self.attempt, self.file_name)
+
+    # Shows an attempt in this row, or hides the row if there's no attempt
+    def set_attempt(self, attempt):
+        self.attempt = attempt
+
+        if not attempt:
+            self.file_name = None
+            self.option.grid_remove()
+
+            return
 
-        self.option = tkinter.Button(scroller.summary_scroll_frame, text=self.file_name,
-                                     command=lambda: constants.start_screen.open_summary_by_path(scroller.username,
-                                                                                                 self.file_path,
-                                                                                                 self.file_name))
-        self.option.pack()
+        self.file_name = attempt.get_display_name()
 
+        score_text = ""
+        if attempt.score is not None:
+            score_text = " (" + str(attempt.score) + "/" + str(attempt.question_count) + ")"
+
+        self.option.config(text=self.file_name + score_text, state=tkinter.NORMAL)
+        self.option.grid()
+
+    # Shows that this row's attempt is still being loaded
+    def set_loading(self):
+        self.attempt = None
+        self.file_name = None
+
+        self.option.config(text="Loading...", state=tkinter.DISABLED)
+        self.option.grid()
+
+
+# Parses a date typed into the summary filter (dd/mm/yyyy). Empty text means no date
+def parse_filter_date(text):
+    text = text.strip()
+
+    if not text or text == "dd/mm/yyyy":
+        return
 
-# A function that grabs the sort order from an ordered file date tuple
-def get_file_order(x):
-    return x[2]
+    return datetime.strptime(text, "%d/%m/%Y")
 
 
-# A class that is used for creating the summary selector window. It may not be needed for the local variable issue,
-# but it's good to have here anyway
+# A class that is used for creating the summary selector window. Attempts are loaded from the results store in the
+# background a page at a time as they're scrolled to (refer to attempt_loader.py), and can be filtered by date
 class SummaryScroller:
+    # How many attempt buttons fit in the window
+    VISIBLE_ROWS = 12
+
+    PAGE_SIZE = 50
+    MAX_CACHED_PAGES = 8
+
+    # How often the window checks for loaded attempts
+    POLL_INTERVAL_MS = 50
+
     def __init__(self):
         self.username = constants.start_screen.stored_username
         self.window = tkinter.Tk()
@@ -472,97 +424,168 @@ class SummaryScroller:
                                           command=lambda: constants.start_screen.close_summaries(True, False))
         self.back_button.pack()
 
-        self.summary_scroll_canvas = tkinter.Canvas(self.window)
-        self.summary_scroll = tkinter.Scrollbar(self.window, orient="vertical",
-                                                command=self.summary_scroll_canvas.yview)
+        # Date filter
+        self.filter_frame = tkinter.Frame(self.window)
+        self.filter_frame.pack()
 
-        self.summary_scroll_frame = tkinter.Frame(self.summary_scroll_canvas)
-        self.summary_scroll_frame.bind(
-            "<Configure>",
-            lambda e: self.summary_scroll_canvas.configure(
-                scrollregion=self.summary_scroll_canvas.bbox("all")
-            )
-        )
+        self.first_date_variable = tkinter.StringVar(self.window, "dd/mm/yyyy")
+        self.last_date_variable = tkinter.StringVar(self.window, "dd/mm/yyyy")
+
+        tkinter.Label(self.filter_frame, text="From").pack(side="left")
+        tkinter.Entry(self.filter_frame, textvariable=self.first_date_variable, width=12).pack(side="left")
+        tkinter.Label(self.filter_frame, text="to").pack(side="left")
+        tkinter.Entry(self.filter_frame, textvariable=self.last_date_variable, width=12).pack(side="left")
+        tkinter.Button(self.filter_frame, text="Filter", command=self.apply_filter).pack(side="left")
+
+        self.count_text = tkinter.StringVar(self.window, "")
+        self.count_label = tkinter.Label(self.window, textvariable=self.count_text)
+        self.count_label.pack()
+
+        self.first_date = None
+        self.end_date = None
+
+        # Page number -> the attempts on that page
+        self.pages = {}
+
+        self.loader = None
+        self.poll_id = None
+
+        self.attempt_list = VirtualList(self.window, self.VISIBLE_ROWS,
+                                        lambda parent, row: SummaryScrollObject(parent, row, self),
+                                        self.update_row)
+        self.attempt_list.pack()
+
+        self.window.bind("<MouseWheel>", self.attempt_list.on_mouse_wheel)
+        self.window.bind("<Button-4>", self.attempt_list.on_mouse_wheel)
+        self.window.bind("<Button-5>", self.attempt_list.on_mouse_wheel)
+
+        self.load_attempts()
+
+    # Starts loading the attempts (with the current filter). The window shows straight away and fills in once the
+    # attempts have been counted
+    def load_attempts(self):
+        self.cancel_loading()
+
+        self.pages.clear()
 
-        self.summary_scroll_canvas.create_window((0, 0), window=self.summary_scroll_frame)
-        self.summary_scroll_canvas.configure(yscrollcommand=self.summary_scroll.set)
+        self.count_text.set("Loading saved attempts...")
+        self.attempt_list.set_row_count(0)
 
-        self.summary_scroll_canvas.pack(side="left", fill="both", expand=True)
-        self.summary_scroll.pack(side="right", fill="y")
+        from attempt_loader import AttemptLoader
 
-        self.user_path = constants.main_path + "\\" + self.username
+        self.loader = AttemptLoader(constants.results_store, self.username, self.first_date, self.end_date,
+                                    self.PAGE_SIZE)
+        self.loader.request_page(0)
 
-        self.scroll_objects = []
+        self.poll_loader()
 
-        self.ordered_files = []
+    # Checks for loaded attempts, and keeps checking until the window is closed
+    def poll_loader(self):
+        self.poll_id = None
 
-        for file in os.scandir(self.user_path):
-            file_name = file.name.replace(".sav", "")
-            minus_index = file_name.index("-")
-            date = file_name[0:minus_index].replace("_", "/")
-            time = file_name[minus_index + 1:len(file_name)].replace("_", ":")
+        if not self.loader:
+            return
+
+        self.loader.poll(self.on_attempts_counted, self.on_page_loaded, self.on_load_failed)
+
+        if self.loader:
+            self.poll_id = self.window.after(self.POLL_INTERVAL_MS, self.poll_loader)
+
+    def on_attempts_counted(self, totals):
+        attempt_count, score, question_count = totals
+
+        count_text = str(attempt_count) + " saved attempt" + (attempt_count != 1 and "s" or "")
+
+        if question_count:
+            count_text += (", " + str(score) + "/" + str(question_count) + " correct (" +
+                           str(round(score / question_count * 100)) + "%)")
+
+        self.count_text.set(count_text)
+        self.attempt_list.set_row_count(attempt_count)
+
+    def on_page_loaded(self, page_number, attempts):
+        # Forgets the page that was loaded the longest time ago
+        if len(self.pages) >= self.MAX_CACHED_PAGES:
+            del self.pages[next(iter(self.pages))]
+
+        self.pages[page_number] = attempts
+
+        # A page that isn't full is the end of the list, even if there were more attempts when they were counted (like
+        # when some of the result files were deleted since), so the rows after it don't keep waiting for attempts
+        if len(attempts) < self.PAGE_SIZE:
+            self.attempt_list.shrink_row_count(page_number * self.PAGE_SIZE + len(attempts))
+        else:
+            self.attempt_list.refresh()
+
+    def on_load_failed(self, error):
+        self.count_text.set("Couldn't load the saved attempts: " + str(error))
+
+        self.cancel_loading()
+
+    # Stops loading attempts in the background
+    def cancel_loading(self):
+        if self.poll_id:
+            self.window.after_cancel(self.poll_id)
+            self.poll_id = None
 
-            day = None
-            month = None
-            year = None
+        if self.loader:
+            self.loader.cancel()
+            self.loader = None
 
-            seconds = None
-            minutes = None
-            hour = None
+    # Gets an attempt by its position in the list. Gives back None if its page is still being loaded
+    def get_attempt(self, index):
+        page_number = index // self.PAGE_SIZE
+        page = self.pages.get(page_number)
 
-            file_name = ""
-            i = 0
-            for num in date.split("/"):
-                if i == 0:
-                    day = int(num)
-                elif i == 1:
-                    month = int(num)
-                else:
-                    year = int(num)
+        if page is None:
+            if self.loader:
+                self.loader.request_page(page_number)
 
-                file_name += (i != 0 and "/" or "") + num.zfill(2)
-                i += 1
+            return
 
-            file_name += " - "
+        index -= page_number * self.PAGE_SIZE
 
-            i = 0
+        if index >= len(page):
+            return
 
-            end_m = None
+        return page[index]
 
-            for num in time.split(":"):
-                if i == 0:
-                    seconds = int(num)
-                elif i == 1:
-                    minutes = int(num)
-                else:
-                    hour = int(num)
+    def update_row(self, row, index):
+        if index is None:
+            row.set_attempt(None)
 
-                if i == 0 and not end_m:
-                    inum = int(num)
-                    if inum > 11:
-                        if inum > 12:
-                            num = str(inum - 12)
-                        end_m = "PM"
-                    else:
-                        end_m = "AM"
+            return
 
-                file_name += (i != 0 and ":" or "") + num.zfill(2)
-                i += 1
+        attempt = self.get_attempt(index)
 
-            file_name += " " + end_m
+        if attempt:
+            row.set_attempt(attempt)
+        else:
+            row.set_loading()
 
-            order = (year * 10000000000 + month * 100000000 + day * 1000000 + hour * 10000 + minutes * 100 + seconds)
+    # Filters the attempts to the dates typed in
+    def apply_filter(self):
+        try:
+            first_date = parse_filter_date(self.first_date_variable.get())
+            last_date = parse_filter_date(self.last_date_variable.get())
+        except ValueError:
+            self.count_text.set("Dates need to be written as dd/mm/yyyy")
 
-            self.ordered_files.append((file, file_name, order))
+            return
+
+        self.first_date = first_date
 
-        self.ordered_files.sort(key=get_file_order, reverse=True)
+        # The last day is included in the filter, so it goes up to the start of the day after
+        self.end_date = last_date and last_date + timedelta(days=1)
 
-        for x in self.ordered_files:
-            self.scroll_objects.append(SummaryScrollObject(x[0], x[1], self))
+        self.load_attempts()
 
 
 # The 'main menu' of the quiz. Used for getting the user's name
 class StartScreen:
+    # How long typing has to stop for before the username gets checked
+    USERNAME_DEBOUNCE_MS = 150
+
     def __init__(self):
         self.screen = TkObject(tkinter.Frame())
 
@@ -595,6 +618,9 @@ class StartScreen:
 
         self.acceptable_username = False
 
+        # The pending username check, if there is one
+        self.validation_id = None
+
         self.play_debounce = False
 
         self.stored_username = None
@@ -608,7 +634,8 @@ class StartScreen:
         self.summary_entry = None
         self.summary_entry_variable = None
 
-        self.summary_answer_objects = []
+        # The summary's checkboxes get reused between questions (refer to widget_pool.py)
+        self.summary_answer_pool = None
 
     # Clears the username text if it's still set to its default value
     def focus_username(self, _ignore=None):
@@ -619,8 +646,24 @@ class StartScreen:
 
         self.focused_username = True
 
-    # Checks whether the current username is acceptable
+    # Checks the username once typing stops, instead of on every key press
     def on_username_changed(self, _ignore=None, _ignore2=None, _ignore3=None):
+        if self.validation_id:
+            self.screen.object.after_cancel(self.validation_id)
+
+        self.validation_id = self.screen.after(self.USERNAME_DEBOUNCE_MS, self.validate_username)
+
+    # Reloads which users have saved results, and checks the username again once they're loaded (refer to
+    # UsernameCache in results_store.py)
+    def refresh_usernames(self):
+        constants.usernames.refresh()
+
+        self.on_username_changed()
+
+    # Checks whether the current username is acceptable
+    def validate_username(self):
+        self.validation_id = None
+
         username = self.username_variable.get()
 
         acceptable = self.focused_username and len(username) > 0
@@ -629,11 +672,24 @@ class StartScreen:
 
         self.set_play_text()
 
+        # The summary button can't be shown until the saved usernames have loaded, so this checks again until they have
+        if not constants.usernames.is_loaded():
+            self.validation_id = self.screen.after(self.USERNAME_DEBOUNCE_MS, self.validate_username)
+
+    # Checks the username straight away if a check is still waiting to happen
+    def flush_username_validation(self):
+        if not self.validation_id:
+            return
+
+        self.screen.object.after_cancel(self.validation_id)
+
+        self.validate_username()
+
     # Set the play and summary buttons' respective visibilities
     def set_play_text(self):
         self.play_button.set_visible(self.acceptable_username)
         self.summary_button.set_visible(
-            self.acceptable_username and os.path.exists(constants.main_path + "\\" + self.username_variable.get()))
+            self.acceptable_username and constants.usernames.contains(self.username_variable.get()))
 
     # Resets the play button debounce
     def reset_play_debounce(self):
@@ -671,25 +727,35 @@ class StartScreen:
         self.screen.set_visible(True)
         constants.quiz_screen.screen.set_visible(False)
 
+        self.refresh_usernames()
+
     # Closes the summary window
     def close_summaries(self, instant, first_menu):
+        import messagebox
+
         if not instant and not messagebox.askyesno("Quit", first_menu and "Are you sure you want to exit these saved "
                                                                           "results and go back to the summary menu?"
                                                            or "Are you sure you would like to quit the summary menu?"):
             return
 
         if constants.summary_window:
-            constants.start_screen.summary_answer_objects.clear()
+            self.summary_answer_pool = None
             destroy_summary_window()
 
+            snapshot_memory("summary_close")
+
         if first_menu:
             self.open_summaries()
         else:
             self.screen.set_visible(True)
             self.summary_wait_text.set_visible(False)
 
+            self.refresh_usernames()
+
     # Opens the summary window
     def open_summaries(self):
+        snapshot_memory("summary_open")
+
         self.screen.set_visible(False)
         self.summary_wait_text.set_visible(True)
 
@@ -699,6 +765,7 @@ class StartScreen:
         constants.summary_window_class = SummaryScroller()
 
     # Updates the result summary question data
+    @metrics.timed("summary_navigation")
     def change_summary_question(self, change, data):
         i = self.summary_index + change
         length = len(data)
@@ -707,11 +774,6 @@ class StartScreen:
         elif i < 0:
             i += length
 
-        for answer_object in self.summary_answer_objects:
-            answer_object.destroy()
-
-        self.summary_answer_objects.clear()
-
         self.summary_index = i
         data = data[i]
 
@@ -720,7 +782,6 @@ class StartScreen:
         correct = data[2]
         answers = data[3]
         input_answers = data[4]
-        mid_answers = data[5]
         correct_answers = data[6]
 
         self.summary_question_text.set("(" + str(i + 1) + "/" + str(constants.answer_length) + ") " + question_text)
@@ -733,38 +794,23 @@ class StartScreen:
             self.summary_result_label.config(fg="red")
 
         if question_type == 3:
-            self.summary_entry_variable = tkinter.StringVar(constants.summary_window, correct and answers[0])
-            self.summary_entry = tkinter.Entry(constants.summary_window, textvariable=self.summary_entry_variable)
-            self.summary_entry.configure(state="disabled")
-
-            self.summary_answer_objects.append(self.summary_entry)
+            self.summary_answer_pool.hide()
 
+            self.summary_entry_variable.set(correct and answers[0])
             self.summary_entry.pack()
         else:
-            for answer in answers:
-                checked = answer in input_answers
+            self.summary_entry.pack_forget()
 
-                in_correct = answer in correct_answers
+            selected_mask = grading.get_answers_mask(answers, input_answers)
+            correct_mask = grading.get_answers_mask(answers, correct_answers)
 
-                correct = checked and in_correct or not checked and not in_correct
-                mid = answer in mid_answers
+            self.summary_answer_pool.show([(selected_mask >> answer_index & 1, answers[answer_index],
+                                            grading.get_answer_colour(answer_index, selected_mask, correct_mask))
+                                           for answer_index in range(0, len(answers))])
 
-                checkbox = SummaryCheckButton(checked, answer, mid and "orange" or correct and "green" or "red")
-
-                self.summary_answer_objects.append(checkbox.object)
-
-                checkbox.object.pack()
-
-        self.summary_result_label.pack_forget()
-        self.summary_next_button.pack_forget()
-        self.summary_back_button.pack_forget()
-
-        self.summary_next_button.pack()
-        self.summary_back_button.pack()
-        self.summary_result_label.pack()
-
-    # Opens a new summary window and loads the data, then updates the window
-    def open_summary_by_path(self, username, file_path, file_name):
+    # Opens a new summary window and opens the attempt's data, then updates the window
+    @metrics.timed("summary_open")
+    def open_summary_attempt(self, username, attempt, file_name):
         if constants.summary_window:
             destroy_summary_window()
 
@@ -786,13 +832,25 @@ class StartScreen:
         result_label_text = tkinter.StringVar(new_window, "UNKNOWN RESULT")
         result_label = tkinter.Label(new_window, textvariable=result_label_text)
 
+        # The answers go in their own frame, so the buttons below never need to be packed again
+        answer_frame = tkinter.Frame(new_window)
+        answer_frame.pack()
+
+        from widget_pool import SummaryCheckButtonPool
+
+        self.summary_answer_pool = SummaryCheckButtonPool(answer_frame)
+
+        self.summary_entry_variable = tkinter.StringVar(new_window, "")
+        self.summary_entry = tkinter.Entry(answer_frame, textvariable=self.summary_entry_variable)
+        self.summary_entry.configure(state="disabled")
+
         self.summary_index = 0
         self.summary_question_text = question_text
         self.summary_result_text = result_label_text
         self.summary_result_label = result_label
 
-        data = open(file_path, "r")
-        data = json.loads(data.readline())
+        # Only the question being shown is read from the store (refer to result_format.py)
+        data = constants.results_store.open_result(attempt)
 
         constants.answer_length = len(data)
 
@@ -801,10 +859,17 @@ class StartScreen:
         self.summary_next_button = tkinter.Button(new_window, text="Next",
                                                   command=lambda: self.change_summary_question(1, data))
 
+        self.summary_next_button.pack()
+        self.summary_back_button.pack()
+        self.summary_result_label.pack()
+
         self.change_summary_question(0, data)
 
     # This is for when the play button has been pressed on the main menu
     def play_game(self, *args):
+        # Enter can be pressed before the username has been checked
+        self.flush_username_validation()
+
         if constants.playing or self.play_debounce or not self.play_button.visible or constants.summary_window:
             return
 
@@ -849,22 +914,38 @@ class StartScreen:
         self.play_game()
 
 
-# A class that I use for the checkboxes of questions to make it a little easier when storing the checkboxes
+# A class that I use for the checkboxes of questions to make it a little easier when storing the checkboxes. Checkboxes
+# get reused from question to question, only their answer changes
 class AnswerObject:
-    def __init__(self, text, row):
+    def __init__(self, row):
         self.checked = tkinter.IntVar(None, 0)
-        self.answer_text = text
+        self.answer_text = None
 
-        self.object = TkObject(tkinter.Checkbutton(text=text, command=self.clicked, variable=self.checked),
+        self.object = TkObject(tkinter.Checkbutton(command=self.clicked, variable=self.checked), visible=False,
                                parent=constants.quiz_screen.answer_container, row=row)
 
+        # The checkbox's normal text colour, for putting back after it's been coloured in by a submitted answer
+        self.default_colour = self.object.object.cget("fg")
+
         self.previous_answer = self.checked.get()
 
+    # Shows an answer in the checkbox, unchecked
+    def set_answer(self, text):
+        self.answer_text = text
+
+        self.checked.set(0)
+        self.previous_answer = 0
+
+        self.object.object.config(text=text, fg=self.default_colour)
+
+        if not self.object.visible:
+            self.object.set_visible(True)
+
     # Updates the quiz when a checkbox is checked/unchecked
     def clicked(self):
         answer = self.checked.get()
 
-        question_type = constants.question_selector.get_current_question().question_type
+        question_type = constants.quiz_session.get_current_question().question_type
 
         on = answer == 1
 
@@ -901,8 +982,6 @@ class AnswerObject:
 # The quiz GUI
 class QuizScreen:
     def __init__(self):
-        self.input_entry = None
-
         self.screen = TkObject(tkinter.Frame())
 
         self.welcome_username_text = tkinter.StringVar(None, "Welcome, INSERT NAME HERE")
@@ -928,8 +1007,18 @@ class QuizScreen:
         self.result_label = TkObject(tkinter.Label(textvariable=self.result_label_text), visible=False,
                                      parent=self.screen)
 
+        # Every answer checkbox that's been made so far. answer_objects holds the ones the current question is using
+        self.answer_rows = []
         self.answer_objects = []
-        self.entry_text = None
+
+        # The entry box for keyboard input questions, which is also reused
+        self.entry_text = tkinter.StringVar(None, "Enter your answer here")
+        self.input_entry = TkObject(tkinter.Entry(textvariable=self.entry_text), visible=False,
+                                    parent=self.answer_container, row=1)
+
+        self.input_entry.object.bind("<FocusIn>", self.clear_entry_text)
+
+        self.entry_text.trace("w", self.set_submit_visibility)
 
         self.clicked_entry = False
 
@@ -940,8 +1029,6 @@ class QuizScreen:
 
         self.answer_checked = False
 
-        self.current_results = None
-
     # Determines whether an entry box has valid text
     def is_answer_input_valid(self):
         answer_text = self.entry_text.get()
@@ -959,43 +1046,40 @@ class QuizScreen:
         self.entry_text.set("")
 
     # Submits the user's current answer. Switches to the main menu/summary screen if at the end of the quiz
+    @metrics.timed("submit_answer")
     def submit_answer(self, _ignore=None):
         if self.ready_for_next_question:
             self.ready_for_next_question = False
             self.submit_button_text.set("Submit answer")
 
             # Quiz finished
-            if not constants.question_selector.next_question():
-                user_path = constants.main_path + "\\" + constants.username
-                create_folder_at_path(user_path)
+            if not constants.quiz_session.next_question():
+                print("OUT OF QUESTIONS!")
 
-                print(user_path, self.current_results)
-                date = datetime.now()
-                name = str(date.day) + "_" + str(date.month) + "_" + str(date.year) + "-" + str(date.hour) + "_" + str(
-                    date.minute) + "_" + str(date.second)
-                data = open(user_path + "\\" + str(name) + ".sav", "w")
+                print(constants.username, constants.quiz_session.results)
 
-                data.write(json.dumps(self.current_results))
+                # Saved in the background, the summary is only opened once the result has actually been saved
+                open_summary = _ignore == "SUMMARY"
+                constants.result_writer.save(constants.username, datetime.now(), constants.quiz_session.results,
+                                             lambda attempt, error: self.on_result_saved(attempt, error, open_summary))
 
                 self.clear_screen()
                 self.question_label.set_visible(False)
                 self.answer_container.set_visible(False)
                 self.submit_button.set_visible(False)
                 self.result_label.set_visible(False)
-                constants.question_selector.reset()
+                constants.quiz_session.reset()
                 constants.start_screen.switch_to_main_screen()
 
                 # Resets the quiz values
                 for name, value in constants.default_quiz_values.items():
                     setattr(self, name, value)
 
-                if _ignore == "SUMMARY":
-                    constants.start_screen.open_summaries()
+                snapshot_memory("quiz_end")
 
                 return
 
-            self.last_question = constants.question_selector.current_question >= len(
-                constants.question_selector.preset_questions) - 1
+            self.last_question = constants.quiz_session.is_last_question()
 
             self.update_quiz()
 
@@ -1004,7 +1088,7 @@ class QuizScreen:
         if not self.answer_checked:
             return
 
-        question: Question = constants.question_selector.get_current_question()
+        question = constants.quiz_session.get_current_question()
 
         if not question:
             return
@@ -1017,53 +1101,21 @@ class QuizScreen:
 
         self.submit_button_text.set("Submitting answer...")
 
-        answers = []
-        question_answers = question.correct
-
-        mid_answers = []
-
         if question_type == 3:
-            answers.append(self.entry_text.get())
-            mid_answers.append(0)
+            correct = constants.quiz_session.submit_typed_answer(self.entry_text.get())
 
             self.input_entry.object.config(state=tkinter.DISABLED)
         else:
-            for answer_object in self.answer_objects:
-                checked = answer_object.checked.get() == 1
-                answer_needed = answer_object.answer_text in question_answers
-
-                correct = checked == answer_needed
-                mid = False
-
-                if not correct and answer_needed:
-                    mid = True
-
-                answer_object.object.object.config(fg=correct and "green" or mid and "orange" or "red")
-
-                if mid:
-                    mid_answers.append(answer_object.answer_text)
+            selected_mask = 0
+            for answer_index in range(0, len(self.answer_objects)):
+                if self.answer_objects[answer_index].checked.get() == 1:
+                    selected_mask |= 1 << answer_index
 
-                if checked:
-                    answers.append(answer_object.answer_text)
+            for answer_index in range(0, len(self.answer_objects)):
+                self.answer_objects[answer_index].object.object.config(
+                    fg=grading.get_answer_colour(answer_index, selected_mask, question.correct_mask))
 
-        correct_answers = []
-        incorrect_answers = []
-
-        for answer in answers:
-            correct = answer in question_answers
-
-            if correct:
-                correct_answers.append(answer)
-            else:
-                incorrect_answers.append(answer)
-
-        answer_type = question.answer_type
-        correct_length = len(correct_answers)
-        correct = len(incorrect_answers) == 0 and (answer_type == 1 and correct_length == len(
-            question_answers) or answer_type == 2 and correct_length >= 1 or answer_type == 3 and correct_length > 1)
-
-        self.current_results.append(
-            (question.question_text, question_type, correct, question.possible, answers, mid_answers, question.correct))
+            correct = constants.quiz_session.submit_selection(selected_mask)
 
         self.submit_button_text.set(self.last_question and "Finish quiz" or "Next question")
         self.summary_button.set_visible(self.last_question)
@@ -1079,11 +1131,27 @@ class QuizScreen:
 
         self.ready_for_next_question = True
 
+    # Runs once a finished quiz's result has been saved by the result writer
+    def on_result_saved(self, attempt, error, open_summary):
+        if error:
+            import messagebox
+
+            messagebox.showerror("Save failed", "Your result couldn't be saved: " + str(error))
+
+            return
+
+        # The summary button depends on whether the user has saved results
+        constants.usernames.add(attempt.username)
+        constants.start_screen.set_play_text()
+
+        if open_summary and not constants.playing and not constants.summary_window:
+            constants.start_screen.open_summaries()
+
     # Sets the submit button's visibility based on if the user has entered a valid answer
     def set_submit_visibility(self, _ignore=None, _ignore2=None, _ignore3=None):
         submit_visible = False
 
-        if constants.question_selector.get_current_question().question_type == 3:
+        if constants.quiz_session.get_current_question().question_type == 3:
             submit_visible = self.is_answer_input_valid()
         else:
             for other_answer in self.answer_objects:
@@ -1096,56 +1164,85 @@ class QuizScreen:
 
     # Sets up the quiz
     def start_quiz(self):
-        constants.question_selector.setup()
+        snapshot_memory("quiz_start")
+
+        if not constants.quiz_session:
+            constants.quiz_session = create_quiz_session()
+
+        constants.quiz_session.start(constants.username)
 
         self.update_quiz()
 
-    # Clears the answer objects
+    # Hides the answer objects (they're kept around to be used by the next question)
     def clear_screen(self):
-        self.answer_container.clear_children()
+        self.hide_answer_rows(0)
+
+        if self.input_entry.visible:
+            self.input_entry.set_visible(False)
+
         self.answer_objects.clear()
 
-    # Removes all the answers, changes the question title and creates all necessary checkboxes/entry boxes
+    # Hides every answer checkbox from first_row onwards
+    def hide_answer_rows(self, first_row):
+        for i in range(first_row, len(self.answer_rows)):
+            if self.answer_rows[i].object.visible:
+                self.answer_rows[i].object.set_visible(False)
+
+    # Changes the question title and shows all necessary checkboxes/entry boxes. Checkboxes left over from the last
+    # question are reused, new ones are only made when a question has more answers than any before it
+    @metrics.timed("update_quiz")
     def update_quiz(self):
         self.clicked_entry = False
         self.answer_checked = False
 
-        if not self.current_results:
-            self.current_results = []
-
-        current_question: Question = constants.question_selector.get_current_question()
+        current_question = constants.quiz_session.get_current_question()
 
         self.question_text.set(
-            "(" + str(constants.question_selector.current_question + 1) + "/" + str(
-                len(constants.question_selector.preset_questions)) + ") " +
+            "(" + str(constants.quiz_session.get_question_number()) + "/" + str(
+                constants.quiz_session.get_question_count()) + ") " +
             current_question.question_text
         )
 
-        self.clear_screen()
+        self.answer_objects.clear()
 
         question_type = current_question.question_type
 
         row = 1
 
         if question_type == 1 or question_type == 2:
-            for answer in current_question.possible:
-                self.answer_objects.append(AnswerObject(answer, row))
+            if self.input_entry.visible:
+                self.input_entry.set_visible(False)
+
+            possible = current_question.possible
+
+            while len(self.answer_rows) < len(possible):
+                self.answer_rows.append(AnswerObject(len(self.answer_rows) + 1))
+
+            for answer in possible:
+                answer_object = self.answer_rows[row - 1]
+                answer_object.set_answer(answer)
+
+                self.answer_objects.append(answer_object)
 
                 row += 1
+
+            self.hide_answer_rows(len(possible))
         else:
-            self.entry_text = tkinter.StringVar(None, "Enter your answer here")
+            self.hide_answer_rows(0)
+
+            self.entry_text.set("Enter your answer here")
             self.last_entry_text = self.entry_text.get()
 
-            self.input_entry = TkObject(tkinter.Entry(textvariable=self.entry_text), parent=self.answer_container,
-                                        row=row)
+            self.input_entry.object.config(state=tkinter.NORMAL)
+            self.input_entry.set_visible(True)
             row += 1
 
-            self.answer_objects.append(
-                self.input_entry)
-
-            self.input_entry.object.bind("<FocusIn>", self.clear_entry_text)
+            # The entry is reused, so it still has focus if the last question was typed too. FocusIn won't happen
+            # again, so the placeholder is cleared here instead
+            if self.input_entry.object.focus_get() == self.input_entry.object:
+                self.clear_entry_text()
 
-            self.entry_text.trace("w", self.set_submit_visibility)
+            self.answer_objects.append(self.input_entry)
 
         self.submit_button.row = row
         self.summary_button.row = row + 1
@@ -1185,76 +1282,68 @@ class GameGui:
             self.default_quiz_values[name] = value
 
 
-# The class that decides what questions to be used and in what order
-class QuestionSelector:
-    def __init__(self):
-        self.current_question = None
-        self.remaining_questions = None
+# The class that holds the entire program together
+def create_gui():
+    return GameGui()
 
-        self.preset_questions = None
 
-    # Sets up the question selector
-    def setup(self):
-        self.current_question = 0
+# Creates the quiz session, which runs the actual quiz (refer to quiz_engine.py)
+def create_quiz_session():
+    from quiz_engine import QuizSession
 
-        self.remaining_questions = constants.questions.copy()
-        self.preset_questions = []
+    return QuizSession(get_questions())
 
-        for i in range(0, random.randrange(12, 17)):
-            question = self.obtain_unique_question()
 
-            if not question:
-                print("Not enough questions!")
+# Loads what fast start puts off until the first quiz starts
+def load_deferred():
+    if not constants.quiz_session:
+        constants.quiz_session = create_quiz_session()
 
-                break
 
-            self.preset_questions.append(question)
+# Starts tracing memory, if memory profiling is on
+def start_memory_profiler():
+    if not constants.memory_profile:
+        return
 
-    # Gets a unique question from all the possible questions in the quiz
-    def obtain_unique_question(self):
-        if len(self.remaining_questions) == 0:
-            return
+    from memory_profiling import MemoryProfiler
 
-        question = random.choice(self.remaining_questions)
+    profiler = MemoryProfiler()
+    profiler.start()
 
-        self.remaining_questions.remove(question)
+    return profiler
 
-        return question
 
-    # Gets the current question when in the quiz screen
-    def get_current_question(self):
-        return self.preset_questions and self.preset_questions[self.current_question]
+# Starts watching the window's event loop for stalls, if the lag monitor is on
+def start_lag_monitor(window):
+    if not constants.lag_threshold_ms:
+        return
 
-    # Proceeds to the next question in the quiz screen
-    def next_question(self):
-        next_id = self.current_question + 1
+    from lag_monitor import LagMonitor
 
-        if next_id >= len(self.preset_questions):
-            print("OUT OF QUESTIONS!")
+    monitor = LagMonitor(window, constants.lag_threshold_ms)
+    monitor.start()
 
-            return
+    return monitor
 
-        self.current_question = next_id
 
-        return next_id
+# Creates the store that results are saved to. Gives back the store, and a SavImport if the old .sav results still need
+# to be copied into the SQLite store. They're copied in the background, and the .sav results are used as they are until
+# that's done (refer to Quiz.poll_sav_import). If copying them fails it's tried again the next time the quiz starts
+def create_results_store():
+    file_store = FileResultsStore(constants.main_path)
 
-    # Resets the question selector
-    def reset(self):
-        self.preset_questions.clear()
-        self.preset_questions = None
-        self.current_question = None
-        self.remaining_questions.clear()
-        self.remaining_questions = None
+    if constants.results_backend == "file":
+        return file_store, None
 
+    store = SqliteResultsStore(os.path.join(constants.main_path, DATABASE_FILE_NAME))
 
-# The class that holds the entire program together
-def create_gui():
-    return GameGui()
+    if store.get_meta(SAV_IMPORT_KEY):
+        return store, None
 
+    sav_import = SavImport(file_store, store)
+    sav_import.start()
 
-# Creates the question selector
-def create_question_selector():
-    return QuestionSelector()
+    return file_store, sav_import
 
 
 # The main quiz handler. Starts the entire program
@@ -1262,6 +1351,9 @@ class Quiz(tkinter.Tk):
     def __init__(self):
         super().__init__()
 
+        # Started first, so everything the quiz makes is traced
+        constants.memory_profiler = start_memory_profiler()
+
         constants.window = self
 
         self.title("The Almighty Quiz")
@@ -1272,24 +1364,99 @@ class Quiz(tkinter.Tk):
 
         self.grid_columnconfigure(0, weight=1)
 
+        constants.layout_scheduler = LayoutScheduler(self)
+
+        self.results_store, self.sav_import = create_results_store()
+        constants.results_store = self.results_store
+
+        self.usernames = UsernameCache(self.results_store)
+        self.usernames.refresh()
+        constants.usernames = self.usernames
+
+        self.result_writer = ResultWriter(self.results_store)
+        constants.result_writer = self.result_writer
+        self.poll_result_writer()
+
+        self.lag_monitor = start_lag_monitor(self)
+
         self.gui = create_gui()
         constants.gui = self.gui
 
-        self.question_selector = create_question_selector()
-        constants.question_selector = self.question_selector
+        # The quiz session (and the question bank) are made when the first quiz starts, unless fast start is off
+        if not constants.fast_start:
+            load_deferred()
 
         constants.gui.setup()
 
+    # Runs the callbacks of results that have finished saving in the background
+    def poll_result_writer(self):
+        constants.result_writer.poll()
+
+        if self.sav_import:
+            self.poll_sav_import()
+
+        self.after(100, self.poll_result_writer)
+
+    # Switches over to the SQLite store once the .sav results have been copied into it. They're copied twice: the second
+    # time only picks up results saved while the first copy was running (everything else is skipped), and it's the one
+    # that marks the import as done
+    def poll_sav_import(self):
+        sav_import = self.sav_import
+
+        if sav_import.is_running():
+            return
+
+        if sav_import.error:
+            print("Couldn't import the saved .sav results, they'll be imported next time: " + str(sav_import.error))
+
+            self.sav_import = None
+
+            if sav_import.store is not self.results_store:
+                sav_import.store.close()
+        elif sav_import.store is not self.results_store:
+            # The store can't be swapped while results are being saved to the old one
+            if self.result_writer.is_busy():
+                return
+
+            self.set_results_store(sav_import.store)
+
+            sav_import.start(SAV_IMPORT_KEY)
+        else:
+            print("Imported " + str(sav_import.imported) + " saved results into " + sav_import.store.database_path)
+
+            self.sav_import = None
+
+    # Makes everything use a different results store
+    def set_results_store(self, store):
+        self.results_store = store
+        constants.results_store = store
+
+        self.result_writer.store = store
+        self.usernames.store = store
+
     # Runs when the main window close button is pressed. Attempts to close all windows
     def close_window(self):
+        import messagebox
+
         if not messagebox.askyesno("Quit", "Are you sure you would like to quit The Almighty Quiz?"):
             return
 
+        if self.lag_monitor:
+            self.lag_monitor.stop()
+
+        # Waits for any results still being saved. This happens before the window is destroyed, and their callbacks
+        # are skipped, since they'd update the window (or open the summaries) as it's going away
+        constants.result_writer.close(run_callbacks=False)
+
         self.destroy()
 
         if constants.summary_window:
             destroy_summary_window()
 
+        # If the .sav results are still being imported it's left to be rolled back, and it's done again next time
+        if not self.sav_import or not self.sav_import.is_running():
+            constants.results_store.close()
+
 
 # The program starts here
 if __name__ == '__main__':
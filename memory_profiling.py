@@ -0,0 +1,118 @@
+import gc
+import os
+import tracemalloc
+
+# A memory profiling mode, for finding what's left behind from quiz to quiz. Turned on by setting QUIZ_MEMORY_PROFILE=1.
+#
+# Python allocations are traced with tracemalloc, and a snapshot is taken at the start and end of every quiz and when
+# the summaries are opened and closed. Whenever a snapshot is taken it's compared with the one it pairs with, and the
+# call sites that grew the most are printed:
+#   quiz_end         compared with the quiz_start of the same quiz
+#   quiz_start       compared with the quiz_start of the last quiz (anything still growing here is being kept between
+#                    quizzes, which is what a leak looks like)
+#   summary_close    compared with summary_open
+#
+# Tracing makes everything a lot slower, so this is only for looking for leaks. Refer to benchmarks/memory_soak.py for
+# a test that plays quiz after quiz and fails if memory keeps growing
+
+# How many frames are kept for each allocation. Growth is grouped by call stack, and every call stack is printed as the
+# line the allocation happened on and the closest line in the quiz's own code that led to it (most allocations happen
+# inside tkinter or json, which doesn't say much on its own)
+TRACEBACK_FRAMES = 8
+
+QUIZ_PATH = os.path.dirname(os.path.abspath(__file__))
+
+# How many call sites are printed for every comparison
+TOP_SITES = 10
+
+# Which snapshot every snapshot is compared with
+SNAPSHOT_PAIRS = {
+    "quiz_end": "quiz_start",
+    "quiz_start": "quiz_start",
+    "summary_close": "summary_open"
+}
+
+
+# Takes a snapshot of every traced allocation, leaving out tracemalloc's own and the import system's
+def take_snapshot():
+    # Objects that are only being kept alive by reference cycles would show up as growth
+    gc.collect()
+
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        tracemalloc.Filter(False, "<unknown>")
+    ))
+
+
+# Gets the call sites that grew the most between two snapshots, as lines of text
+def format_growth(old_snapshot, new_snapshot, top=TOP_SITES):
+    differences = new_snapshot.compare_to(old_snapshot, "traceback")
+    total = sum(difference.size_diff for difference in differences)
+
+    lines = ["Total: " + format_size(total)]
+
+    for difference in [difference for difference in differences if difference.size_diff > 0][:top]:
+        frame = difference.traceback[-1]
+
+        line = "  " + format_size(difference.size_diff) + " (" + format(difference.count_diff, "+d") + " blocks) "
+        line += format_frame(frame)
+
+        quiz_frame = get_quiz_frame(difference.traceback)
+
+        if quiz_frame and quiz_frame != frame:
+            line += " from " + format_frame(quiz_frame)
+
+        lines.append(line)
+
+    return lines
+
+
+# Gets the most recent frame of a traceback that's in the quiz's own code
+def get_quiz_frame(traceback):
+    for frame in reversed(traceback):
+        if frame.filename.startswith(QUIZ_PATH):
+            return frame
+
+
+def format_frame(frame):
+    return frame.filename + ":" + str(frame.lineno)
+
+
+def format_size(size):
+    return format(size / 1024, "+.1f") + " KiB"
+
+
+class MemoryProfiler:
+    def __init__(self, frames=TRACEBACK_FRAMES, top=TOP_SITES):
+        self.frames = frames
+        self.top = top
+
+        # The last snapshot taken for each event
+        self.snapshots = {}
+
+    def start(self):
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+
+    # Takes a snapshot for an event (quiz_start, quiz_end, summary_open or summary_close), and prints how memory grew
+    # since the snapshot it pairs with
+    def snapshot(self, event):
+        snapshot = take_snapshot()
+        old_snapshot = self.snapshots.get(SNAPSHOT_PAIRS.get(event))
+
+        self.snapshots[event] = snapshot
+
+        if not old_snapshot:
+            return
+
+        print("Memory at " + event + " since the last " + SNAPSHOT_PAIRS[event] + ":")
+
+        for line in format_growth(old_snapshot, snapshot, self.top):
+            print(line)
+
+    def stop(self):
+        self.snapshots.clear()
+
+        tracemalloc.stop()
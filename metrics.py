@@ -0,0 +1,215 @@
+import atexit
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+from array import array
+
+# Timing hooks for the parts of the quiz that are worth watching (question loads, update_quiz, submit_answer, result
+# saves, the summary scan and summary navigation). Functions are timed by decorating them:
+#   @metrics.timed("update_quiz")
+#   def update_quiz(self):
+#
+# Metrics are off unless QUIZ_METRICS is set, and when they're off timed gives back the function as it is, so the hooks
+# cost nothing. QUIZ_METRICS picks where the timings go:
+#   histogram             keeps them in memory, and prints p50/p95/p99 for every hook when the quiz closes
+#   jsonl:<path>          adds a line to a JSON lines file for every timing
+#   prometheus:<path>     keeps them in memory, and writes them in the Prometheus text format when the quiz closes
+#
+# A JSON lines file can be turned into the same p50/p95/p99 report later:
+#   python metrics.py metrics.jsonl
+#
+# Anything with record(name, seconds) and close() can be used as a sink by calling enable, as long as it's called
+# before the timed modules are imported (decorators are applied when a module is imported). Timings are recorded from
+# whichever thread they happen on, so sinks need to be thread safe
+
+PERCENTILES = (50, 95, 99)
+
+# The current sink, or None when metrics are off
+sink = None
+
+
+# Keeps every timing in memory, by hook
+class HistogramSink:
+    def __init__(self):
+        self.samples = {}
+        self.lock = threading.Lock()
+
+    def record(self, name, seconds):
+        with self.lock:
+            samples = self.samples.get(name)
+
+            if samples is None:
+                samples = array("d")
+                self.samples[name] = samples
+
+            samples.append(seconds)
+
+    # Gives back {hook: {"count": ..., "total_ms": ..., "p50_ms": ..., "p95_ms": ..., "p99_ms": ...}}
+    def get_report(self):
+        with self.lock:
+            samples = {name: sorted(hook_samples) for name, hook_samples in self.samples.items()}
+
+        return {name: get_summary(hook_samples) for name, hook_samples in samples.items()}
+
+    def format_report(self):
+        return format_report(self.get_report())
+
+    # Writes every hook as a Prometheus summary, in seconds
+    def format_prometheus(self):
+        lines = ["# HELP quiz_hook_duration_seconds How long each timed part of the quiz took",
+                 "# TYPE quiz_hook_duration_seconds summary"]
+
+        with self.lock:
+            samples = {name: sorted(hook_samples) for name, hook_samples in self.samples.items()}
+
+        for name, hook_samples in sorted(samples.items()):
+            label = 'hook="' + name + '"'
+
+            for percentile in PERCENTILES:
+                lines.append("quiz_hook_duration_seconds{" + label + ',quantile="' + str(percentile / 100) + '"} ' +
+                             repr(get_percentile(hook_samples, percentile)))
+
+            lines.append("quiz_hook_duration_seconds_sum{" + label + "} " + repr(math.fsum(hook_samples)))
+            lines.append("quiz_hook_duration_seconds_count{" + label + "} " + str(len(hook_samples)))
+
+        return "\n".join(lines) + "\n"
+
+    def close(self):
+        print(self.format_report())
+
+
+# A HistogramSink that's written to a file in the Prometheus text format when it's closed
+class PrometheusSink(HistogramSink):
+    def __init__(self, path):
+        super().__init__()
+
+        self.path = path
+
+    def close(self):
+        with open(self.path, "w", encoding="utf-8") as output:
+            output.write(self.format_prometheus())
+
+
+# Adds every timing to a JSON lines file as it happens:
+#   {"name": ..., "time": (unix time), "duration_ms": ...}
+class JsonLinesSink:
+    def __init__(self, path):
+        self.file = open(path, "a", encoding="utf-8")
+        self.lock = threading.Lock()
+
+    def record(self, name, seconds):
+        line = json.dumps({"name": name, "time": time.time(), "duration_ms": seconds * 1000}) + "\n"
+
+        with self.lock:
+            if not self.file.closed:
+                self.file.write(line)
+
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+
+# Gets the nearest rank percentile of sorted samples
+def get_percentile(sorted_samples, percentile):
+    if not sorted_samples:
+        return 0.0
+
+    return sorted_samples[max(math.ceil(percentile / 100 * len(sorted_samples)) - 1, 0)]
+
+
+def get_summary(sorted_samples):
+    summary = {"count": len(sorted_samples), "total_ms": math.fsum(sorted_samples) * 1000}
+
+    for percentile in PERCENTILES:
+        summary["p" + str(percentile) + "_ms"] = get_percentile(sorted_samples, percentile) * 1000
+
+    return summary
+
+
+def format_report(report):
+    lines = ["{:<24} {:>8} {:>10} {:>10} {:>10} {:>12}".format("hook", "count", "p50 ms", "p95 ms", "p99 ms",
+                                                                "total ms")]
+
+    for name, summary in sorted(report.items()):
+        lines.append("{:<24} {:>8} {:>10.3f} {:>10.3f} {:>10.3f} {:>12.3f}".format(
+            name, summary["count"], summary["p50_ms"], summary["p95_ms"], summary["p99_ms"], summary["total_ms"]))
+
+    return "\n".join(lines)
+
+
+# Makes the sink a QUIZ_METRICS setting asks for
+def create_sink(setting):
+    kind, _, path = setting.partition(":")
+
+    if kind == "histogram":
+        return HistogramSink()
+    elif kind == "jsonl":
+        return JsonLinesSink(path or "metrics.jsonl")
+    elif kind == "prometheus":
+        return PrometheusSink(path or "metrics.prom")
+
+    raise ValueError("unknown metrics sink '" + kind + "' (use histogram, jsonl:<path> or prometheus:<path>)")
+
+
+# Starts sending timings to a sink. The sink is closed when Python exits
+def enable(new_sink):
+    global sink
+
+    sink = new_sink
+
+    atexit.register(new_sink.close)
+
+
+# Times every call of the decorated function. Does nothing when metrics are off
+def timed(name):
+    def decorate(function):
+        if not sink:
+            return function
+
+        hook_sink = sink
+
+        @functools.wraps(function)
+        def timed_function(*arguments, **options):
+            start = time.perf_counter()
+
+            try:
+                return function(*arguments, **options)
+            finally:
+                hook_sink.record(name, time.perf_counter() - start)
+
+        return timed_function
+
+    return decorate
+
+
+# Reads a JSON lines file back into a report
+def read_json_lines(path):
+    histogram = HistogramSink()
+
+    with open(path, "r", encoding="utf-8") as lines:
+        for line in lines:
+            data = json.loads(line)
+
+            histogram.record(data["name"], data["duration_ms"] / 1000)
+
+    return histogram.get_report()
+
+
+if os.environ.get("QUIZ_METRICS"):
+    try:
+        enable(create_sink(os.environ["QUIZ_METRICS"]))
+    except (ValueError, OSError) as error:
+        print("Metrics are off, " + str(error))
+
+
+if __name__ == '__main__':
+    if len(sys.argv) != 2:
+        print("Usage: python metrics.py <metrics.jsonl>")
+
+        sys.exit(2)
+
+    print(format_report(read_json_lines(sys.argv[1])))
@@ -0,0 +1,389 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+
+import metrics
+
+# Question bank files are JSON lines, one question per line:
+#   {"text": ..., "question_type": ..., "answer_type": ..., "possible": [...], "correct": [...]}
+#
+# question_type is 1 for single choice, 2 for multi choice and 3 for keyboard input. answer_type is 1 for all answers
+# need to be correct, 2 for one answer and 3 for more than one answer. correct holds the indexes of the correct
+# answers in possible. Blank lines are skipped, and a question's ID is its position among the questions (starting from
+# 0), not the line it sits on.
+#
+# Small banks are read into memory as a QuestionTable (refer to IN_MEMORY_BANK_BYTES). Next to every bigger bank there's
+# a compiled index sidecar (<bank>.idx) holding the byte offset of every question, so a question can be loaded straight
+# from its ID without reading the rest of the bank. The sidecar is rebuilt whenever it's missing or doesn't match the
+# bank anymore (it isn't kept in git, so it's built the first time the bank is opened), but it's best to rebuild it by
+# running this file after editing a bank:
+#   python question_bank.py questions.jsonl
+#
+# The index remembers the size, modified time and a hash of the bank it was built from. If the size and modified time
+# still match the bank isn't read at all. If only the modified time changed (like after copying the bank) the bank is
+# hashed, so an edit that keeps the bank the same size is still noticed. When the hash still matches, the new modified
+# time is written into the index so the bank is only hashed that once
+
+INDEX_MAGIC = b"QIDX"
+INDEX_VERSION = 2
+
+# Magic, version, question count, then the size, modified time (in nanoseconds) and hash of the bank file the index was
+# built from
+INDEX_HEADER = struct.Struct("<4sIQQQ16s")
+INDEX_OFFSET = struct.Struct("<Q")
+
+INDEX_HASH_SIZE = 16
+
+DEFAULT_BANK_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "questions.jsonl")
+
+
+# Turns a list of answer indexes into a bitmask (bit n is set when answer n is correct)
+def get_answer_mask(answer_indexes):
+    mask = 0
+    for answer_index in answer_indexes:
+        mask |= 1 << answer_index
+
+    return mask
+
+
+# Turns a bitmask back into a list of answer indexes
+def get_answer_indexes(mask):
+    return [answer_index for answer_index in range(0, mask.bit_length()) if mask >> answer_index & 1]
+
+
+# The class I use for storing question data. __slots__ keeps each question from needing its own attribute dictionary,
+# and the correct answers are only stored as a bitmask
+class Question:
+    __slots__ = ("question_text", "question_type", "answer_type", "possible", "id", "correct_mask")
+
+    def __init__(self, question_text, question_type, answer_type, possible_answers, correct_answers):
+        self.question_text = question_text
+
+        self.question_type = question_type
+        self.answer_type = answer_type
+
+        self.possible = possible_answers
+
+        self.id = None
+
+        self.correct_mask = get_answer_mask(correct_answers)
+
+    # The correct answers' text, worked out from the bitmask whenever it's needed (only when an answer is recorded)
+    @property
+    def correct(self):
+        return [self.possible[answer_index] for answer_index in get_answer_indexes(self.correct_mask)]
+
+
+# A compact, column based table of questions, used for holding a whole bank in memory. Every question is spread over a
+# few flat arrays instead of being its own object:
+#   - question text is stored as UTF-8 in one byte array, with the offset each question's text starts at
+#   - every answer string is only stored once, and questions store the index of each of their answers
+#   - correct answers are stored as a bitmask over the question's answers (so questions can have up to 64 answers)
+class QuestionTable:
+    MAX_ANSWERS = 64
+
+    def __init__(self):
+        self.text_data = bytearray()
+        self.text_offsets = array("I", [0])
+
+        self.question_types = array("B")
+        self.answer_types = array("B")
+
+        self.answer_pool = []
+        self.answer_pool_indexes = {}
+
+        self.answer_ids = array("I")
+        self.answer_offsets = array("I", [0])
+
+        self.correct_masks = array("Q")
+
+    def __len__(self):
+        return len(self.question_types)
+
+    def __getitem__(self, question_id):
+        return self.get_question(question_id)
+
+    def __iter__(self):
+        for question_id in range(0, len(self)):
+            yield self.get_question(question_id)
+
+    # Gets the pool index of an answer string, adding it to the pool if it's new
+    def intern_answer(self, answer):
+        answer_id = self.answer_pool_indexes.get(answer)
+
+        if answer_id is None:
+            answer_id = len(self.answer_pool)
+
+            self.answer_pool.append(answer)
+            self.answer_pool_indexes[answer] = answer_id
+
+        return answer_id
+
+    # Adds a question to the end of the table and gives back its ID
+    def append(self, question_text, question_type, answer_type, possible_answers, correct_answers):
+        if len(possible_answers) > self.MAX_ANSWERS:
+            raise ValueError("Questions can't have more than " + str(self.MAX_ANSWERS) + " answers")
+
+        self.text_data += question_text.encode("utf-8")
+        self.text_offsets.append(len(self.text_data))
+
+        self.question_types.append(question_type)
+        self.answer_types.append(answer_type)
+
+        for answer in possible_answers:
+            self.answer_ids.append(self.intern_answer(answer))
+
+        self.answer_offsets.append(len(self.answer_ids))
+
+        self.correct_masks.append(get_answer_mask(correct_answers))
+
+        return len(self.question_types) - 1
+
+    # Gets the possible answers of a question
+    def get_possible(self, question_id):
+        pool = self.answer_pool
+
+        return [pool[answer_id] for answer_id in
+                self.answer_ids[self.answer_offsets[question_id]:self.answer_offsets[question_id + 1]]]
+
+    # Gets the text of a question
+    def get_text(self, question_id):
+        return self.text_data[self.text_offsets[question_id]:self.text_offsets[question_id + 1]].decode("utf-8")
+
+    # Builds a Question object for a question in the table
+    def get_question(self, question_id):
+        if question_id < 0 or question_id >= len(self):
+            raise IndexError("Question ID " + str(question_id) + " is not in the question table")
+
+        question = Question(self.get_text(question_id), self.question_types[question_id],
+                            self.answer_types[question_id], self.get_possible(question_id),
+                            get_answer_indexes(self.correct_masks[question_id]))
+        question.id = question_id
+
+        return question
+
+    # Builds a table out of a list of questions (like a QuestionBank). Question IDs are kept as long as the questions
+    # are in ID order
+    @staticmethod
+    def from_questions(questions):
+        table = QuestionTable()
+
+        for question in questions:
+            table.append(question.question_text, question.question_type, question.answer_type, question.possible,
+                         get_answer_indexes(question.correct_mask))
+
+        return table
+
+    # Reads a whole bank file straight into a table, skipping the Question objects
+    @staticmethod
+    def from_bank_file(bank_path):
+        table = QuestionTable()
+
+        with open(bank_path, "rb") as bank:
+            for line in bank:
+                if not line.strip():
+                    continue
+
+                data = json.loads(line)
+                table.append(data["text"], data["question_type"], data["answer_type"], data["possible"],
+                             data["correct"])
+
+        return table
+
+
+# Gets the path of the index sidecar for a bank
+def get_index_path(bank_path):
+    return bank_path + ".idx"
+
+
+def create_bank_hash():
+    return hashlib.blake2b(digest_size=INDEX_HASH_SIZE)
+
+
+# Hashes a whole bank file
+def get_bank_hash(bank_path):
+    bank_hash = create_bank_hash()
+
+    with open(bank_path, "rb") as bank:
+        for block in iter(lambda: bank.read(1024 * 1024), b""):
+            bank_hash.update(block)
+
+    return bank_hash.digest()
+
+
+# Reads through a bank and writes the offset of every question into its index sidecar
+def compile_index(bank_path, index_path=None):
+    index_path = index_path or get_index_path(bank_path)
+
+    offsets = []
+    bank_hash = create_bank_hash()
+
+    # The modified time is taken before reading, so if the bank changes while it's being read the index won't match it
+    modified_time = os.stat(bank_path).st_mtime_ns
+
+    with open(bank_path, "rb") as bank:
+        offset = 0
+        for line in bank:
+            if line.strip():
+                offsets.append(offset)
+
+            offset += len(line)
+            bank_hash.update(line)
+
+    # Written to a temporary file first so a half written index is never picked up
+    temp_path = index_path + ".tmp"
+    with open(temp_path, "wb") as index:
+        index.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(offsets), offset, modified_time,
+                                      bank_hash.digest()))
+
+        for question_offset in offsets:
+            index.write(INDEX_OFFSET.pack(question_offset))
+
+    os.replace(temp_path, index_path)
+
+    return len(offsets)
+
+
+# Checks whether an index sidecar exists and still matches its bank
+def is_index_current(bank_path, index_path):
+    if not os.path.isfile(index_path):
+        return False
+
+    with open(index_path, "rb") as index:
+        header = index.read(INDEX_HEADER.size)
+
+    if len(header) != INDEX_HEADER.size:
+        return False
+
+    magic, version, count, bank_size, modified_time, bank_hash = INDEX_HEADER.unpack(header)
+
+    if magic != INDEX_MAGIC or version != INDEX_VERSION:
+        return False
+
+    bank_stat = os.stat(bank_path)
+
+    if bank_size != bank_stat.st_size:
+        return False
+
+    if modified_time == bank_stat.st_mtime_ns:
+        return True
+
+    if bank_hash != get_bank_hash(bank_path):
+        return False
+
+    # The bank only got touched, so the index is still current
+    try:
+        with open(index_path, "r+b") as index:
+            index.write(INDEX_HEADER.pack(magic, version, count, bank_size, bank_stat.st_mtime_ns, bank_hash))
+    except OSError as error:
+        print("Couldn't update the question index " + index_path + ": " + str(error))
+
+    return True
+
+
+# Banks up to this size (in bytes) are read into a QuestionTable when they're opened, which is about a few thousand
+# questions. Reading the whole bank takes longer the bigger it is, so bigger banks are read a question at a time instead
+IN_MEMORY_BANK_BYTES = 1024 * 1024
+
+# How many built questions a QuestionBank keeps around. Questions never change once they're built, so every quiz can
+# share them, and most quizzes draw from the same few hundred questions anyway
+QUESTION_CACHE_SIZE = 512
+
+
+# A question bank backed by a bank file. Small banks are read into a QuestionTable when they're opened, so questions are
+# built straight from memory. Bigger banks use their index: only the index header is read when they're opened, and
+# questions are read from the bank file when they're asked for. Either way, built questions are cached by their ID
+class QuestionBank:
+    def __init__(self, bank_path=DEFAULT_BANK_PATH, in_memory_bytes=IN_MEMORY_BANK_BYTES,
+                 cache_size=QUESTION_CACHE_SIZE):
+        self.bank_path = bank_path
+        self.index_path = get_index_path(bank_path)
+
+        self.cache = {}
+        self.cache_size = cache_size
+
+        self.table = None
+        self.index = None
+        self.bank = None
+
+        if os.path.getsize(bank_path) <= in_memory_bytes:
+            self.table = QuestionTable.from_bank_file(bank_path)
+            self.count = len(self.table)
+
+            return
+
+        if not is_index_current(self.bank_path, self.index_path):
+            print("Compiling question index " + self.index_path)
+            compile_index(self.bank_path, self.index_path)
+
+        with open(self.index_path, "rb") as index:
+            self.index = mmap.mmap(index.fileno(), 0, access=mmap.ACCESS_READ)
+
+        self.count = INDEX_HEADER.unpack_from(self.index, 0)[2]
+
+        self.bank = open(self.bank_path, "rb")
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, question_id):
+        return self.get_question(question_id)
+
+    def __iter__(self):
+        for question_id in range(0, self.count):
+            yield self.get_question(question_id)
+
+    # Gets the byte offset of a question in the bank file
+    def get_offset(self, question_id):
+        if question_id < 0 or question_id >= self.count:
+            raise IndexError("Question ID " + str(question_id) + " is not in the question bank")
+
+        return INDEX_OFFSET.unpack_from(self.index, INDEX_HEADER.size + question_id * INDEX_OFFSET.size)[0]
+
+    # Gets a single question, from the cache if it's been built before
+    def get_question(self, question_id):
+        question = self.cache.get(question_id)
+
+        if question:
+            return question
+
+        question = self.load_question(question_id)
+
+        # Drops the oldest question once the cache is full
+        if len(self.cache) >= self.cache_size:
+            del self.cache[next(iter(self.cache))]
+
+        self.cache[question_id] = question
+
+        return question
+
+    # Builds a single question from the table, or reads it from the bank file
+    @metrics.timed("question_load")
+    def load_question(self, question_id):
+        if self.table:
+            return self.table.get_question(question_id)
+
+        self.bank.seek(self.get_offset(question_id))
+        data = json.loads(self.bank.readline())
+
+        question = Question(data["text"], data["question_type"], data["answer_type"], data["possible"],
+                            data["correct"])
+        question.id = question_id
+
+        return question
+
+    def close(self):
+        self.cache.clear()
+
+        if self.index:
+            self.index.close()
+            self.bank.close()
+
+
+if __name__ == '__main__':
+    for path in sys.argv[1:] or [DEFAULT_BANK_PATH]:
+        print("Indexed " + str(compile_index(path)) + " questions in " + path)
@@ -0,0 +1,173 @@
+import random
+
+import grading
+from sampling import UniqueIdSampler
+
+# The quiz itself, without any GUI. The Tk GUI in main.py drives a QuizSession, but a session works just as well on its
+# own (for tests, servers or simulations), since nothing in here needs a window:
+#   session = QuizSession(QuestionBank())
+#   question = session.start("username")
+#   session.submit_selection(1 << 2)
+#   session.next_question()
+
+MIN_QUESTIONS = 12
+MAX_QUESTIONS = 16
+
+
+# The class that decides what questions to be used and in what order. Questions are drawn by ID (refer to sampling.py),
+# and only the questions it actually picks are loaded from the question bank
+class QuestionSelector:
+    def __init__(self, questions, rng=random):
+        self.questions = questions
+        self.rng = rng
+
+        self.current_question = None
+        self.remaining_question_ids = None
+
+        self.preset_question_ids = None
+        self.preset_questions = None
+
+    # Sets up the question selector
+    def setup(self):
+        self.current_question = 0
+
+        self.remaining_question_ids = UniqueIdSampler(len(self.questions), self.rng)
+        self.preset_question_ids = []
+        self.preset_questions = []
+
+        for i in range(0, self.rng.randrange(MIN_QUESTIONS, MAX_QUESTIONS + 1)):
+            question = self.obtain_unique_question()
+
+            if not question:
+                print("Not enough questions!")
+
+                break
+
+            self.preset_question_ids.append(question.id)
+            self.preset_questions.append(question)
+
+    # Gets a unique question from all the possible questions in the quiz
+    def obtain_unique_question(self):
+        question_id = self.remaining_question_ids.draw()
+
+        if question_id is None:
+            return
+
+        return self.questions.get_question(question_id)
+
+    # Gets the current question when in the quiz screen
+    def get_current_question(self):
+        return self.preset_questions and self.preset_questions[self.current_question]
+
+    # Proceeds to the next question in the quiz screen
+    def next_question(self):
+        next_id = self.current_question + 1
+
+        if next_id >= len(self.preset_questions):
+            return
+
+        self.current_question = next_id
+
+        return next_id
+
+    # Resets the question selector
+    def reset(self):
+        self.preset_questions.clear()
+        self.preset_questions = None
+        self.preset_question_ids.clear()
+        self.preset_question_ids = None
+        self.current_question = None
+        self.remaining_question_ids = None
+
+
+# One play through of the quiz: picks the questions, grades the answers and keeps the results. Results are kept in the
+# same format as saved result files, one entry per answered question:
+#   [question text, question type, correct, possible answers, given answers, missed answers, correct answers]
+class QuizSession:
+    def __init__(self, questions, rng=random):
+        self.selector = QuestionSelector(questions, rng)
+
+        self.username = None
+        self.results = None
+
+        self.answered = False
+
+    # Starts a new quiz and gives back the first question
+    def start(self, username=None):
+        self.username = username
+        self.results = []
+
+        self.answered = False
+
+        self.selector.setup()
+
+        return self.get_current_question()
+
+    # Gets the question that's currently being answered
+    def get_current_question(self):
+        return self.selector.get_current_question()
+
+    # Gets the number of the current question (starting from 1)
+    def get_question_number(self):
+        return self.selector.current_question + 1
+
+    # Gets how many questions are in this quiz
+    def get_question_count(self):
+        return len(self.selector.preset_questions)
+
+    # Checks whether the current question is the last one in this quiz
+    def is_last_question(self):
+        return self.selector.current_question >= len(self.selector.preset_questions) - 1
+
+    # Records the answer to the current question. Returns whether it was correct, or None if the current question has
+    # already been answered
+    def record_answer(self, answers, mid_answers, correct):
+        if self.answered:
+            return
+
+        question = self.get_current_question()
+
+        self.results.append([question.question_text, question.question_type, correct, question.possible, answers,
+                             mid_answers, question.correct])
+
+        self.answered = True
+
+        return correct
+
+    # Answers the current question with a bitmask of the selected answers (refer to grading.py)
+    def submit_selection(self, selected_mask):
+        question = self.get_current_question()
+
+        return self.record_answer(grading.get_mask_answers(question.possible, selected_mask),
+                                  grading.get_mask_answers(question.possible,
+                                                           grading.get_missed_mask(selected_mask,
+                                                                                   question.correct_mask)),
+                                  grading.grade_question(question, selected_mask))
+
+    # Answers the current (keyboard input) question with the text the user typed in
+    def submit_typed_answer(self, typed_answer):
+        question = self.get_current_question()
+
+        return self.record_answer([typed_answer], [0], grading.grade_typed_answer(question, typed_answer))
+
+    # Moves onto the next question. Returns False once there are no questions left
+    def next_question(self):
+        if self.selector.next_question() is None:
+            return False
+
+        self.answered = False
+
+        return True
+
+    # Gets how many questions have been answered correctly so far
+    def get_score(self):
+        return sum(1 for result in self.results if result[2])
+
+    # Resets the session so it can be started again
+    def reset(self):
+        self.selector.reset()
+
+        self.username = None
+        self.results = None
+
+        self.answered = False
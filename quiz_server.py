@@ -0,0 +1,276 @@
+import asyncio
+import json
+import sys
+
+from question_bank import QuestionBank
+from quiz_engine import QuizSession
+
+# A server that lets lots of people play the quiz at once, without one Tk window per machine. Every connection gets its
+# own QuizSession (refer to quiz_engine.py), and they all share one question bank.
+#
+# The protocol is JSON lines: the client sends one request per line and gets one response line back.
+#   {"action": "start", "username": "..."}  -> the first question
+#   {"action": "submit", "answers": [0, 2]} -> whether it was correct (answers are indexes of possible answers)
+#   {"action": "submit", "answer": "..."}   -> the same, but for keyboard input questions
+#   {"action": "next"}                      -> the next question, or the final score once the quiz is finished
+#   {"action": "quit"}                      -> closes the connection
+# Errors come back as {"error": "..."}.
+#
+# Usage:
+#   python quiz_server.py [host] [port]          runs the server
+#   python quiz_server.py client [host] [port]   plays the quiz in the terminal
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8023
+
+# Requests longer than this are refused, so one client can't make the server buffer huge lines
+MAX_REQUEST_SIZE = 64 * 1024
+
+
+# Turns a question into what gets sent to the client (without the correct answers)
+def get_question_message(session):
+    question = session.get_current_question()
+
+    return {"question": {"id": question.id, "text": question.question_text, "question_type": question.question_type,
+                         "possible": question.possible},
+            "number": session.get_question_number(), "count": session.get_question_count()}
+
+
+# Handles one request for a session and gives back the response
+def handle_request(session, request):
+    action = request.get("action")
+
+    if action == "start":
+        session.start(request.get("username"))
+
+        return get_question_message(session)
+
+    if session.results is None:
+        return {"error": "The quiz hasn't been started"}
+
+    if action == "submit":
+        question = session.get_current_question()
+
+        if question.question_type == 3:
+            correct = session.submit_typed_answer(str(request.get("answer", "")))
+        else:
+            answers = request.get("answers", [])
+
+            if not isinstance(answers, list):
+                return {"error": "answers must be a list of answer indexes"}
+
+            selected_mask = 0
+            for answer_index in answers:
+                # bool is a subclass of int, but true isn't an answer index
+                if (not isinstance(answer_index, int) or isinstance(answer_index, bool) or answer_index < 0 or
+                        answer_index >= len(question.possible)):
+                    return {"error": "Invalid answer index " + json.dumps(answer_index)}
+
+                selected_mask |= 1 << answer_index
+
+            if selected_mask == 0:
+                return {"error": "At least one answer needs to be selected"}
+
+            # Single choice questions only allow one answer, like the checkboxes in the quiz screen
+            if question.question_type == 1 and selected_mask.bit_count() > 1:
+                return {"error": "This question only allows one answer"}
+
+            correct = session.submit_selection(selected_mask)
+
+        if correct is None:
+            return {"error": "This question has already been answered"}
+
+        return {"correct": correct, "correct_answers": session.results[-1][6], "last": session.is_last_question()}
+
+    if action == "next":
+        if not session.answered:
+            return {"error": "This question hasn't been answered yet"}
+
+        if not session.next_question():
+            response = {"finished": True, "score": session.get_score(), "count": session.get_question_count()}
+
+            session.reset()
+
+            return response
+
+        return get_question_message(session)
+
+    return {"error": "Unknown action " + str(action)}
+
+
+# Serves the quiz to lots of clients at once
+class QuizServer:
+    def __init__(self, questions, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.questions = questions
+
+        self.host = host
+        self.port = port
+
+        self.server = None
+
+        self.session_count = 0
+
+    # Runs one client's connection until they quit or disconnect
+    async def handle_client(self, reader, writer):
+        session = QuizSession(self.questions)
+        self.session_count += 1
+
+        try:
+            while True:
+                try:
+                    line = await reader.readline()
+                except ValueError:
+                    writer.write(b'{"error": "Request too long"}\n')
+
+                    break
+
+                if not line:
+                    break
+
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    request = None
+
+                if not isinstance(request, dict):
+                    response = {"error": "Requests must be JSON objects"}
+                elif request.get("action") == "quit":
+                    break
+                else:
+                    # A request that breaks the session shouldn't take the connection down with it
+                    try:
+                        response = handle_request(session, request)
+                    except Exception as error:
+                        print("Couldn't handle request " + line.decode("utf-8", "replace").strip() + ": " + repr(error))
+
+                        response = {"error": "The request couldn't be handled"}
+
+                writer.write(json.dumps(response).encode("utf-8") + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            self.session_count -= 1
+
+            writer.close()
+
+            # Waits for the connection to actually close, so its transport isn't left for the garbage collector
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def start(self):
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port, limit=MAX_REQUEST_SIZE)
+
+        # Lets port 0 pick a free port
+        self.port = self.server.sockets[0].getsockname()[1]
+
+        return self
+
+    async def serve_forever(self):
+        if not self.server:
+            await self.start()
+
+        print("Serving the quiz on " + self.host + ":" + str(self.port))
+
+        async with self.server:
+            await self.server.serve_forever()
+
+    async def close(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+
+# A client for the quiz server
+class QuizClient:
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT):
+        self.host = host
+        self.port = port
+
+        self.reader = None
+        self.writer = None
+
+    async def connect(self):
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+
+        return self
+
+    # Sends a request and waits for its response
+    async def request(self, action, **arguments):
+        arguments["action"] = action
+
+        self.writer.write(json.dumps(arguments).encode("utf-8") + b"\n")
+        await self.writer.drain()
+
+        return json.loads(await self.reader.readline())
+
+    async def start(self, username):
+        return await self.request("start", username=username)
+
+    async def submit(self, answers):
+        return await self.request("submit", answers=answers)
+
+    async def submit_typed(self, answer):
+        return await self.request("submit", answer=answer)
+
+    async def next(self):
+        return await self.request("next")
+
+    async def close(self):
+        self.writer.write(b'{"action": "quit"}\n')
+        self.writer.close()
+
+        await self.writer.wait_closed()
+
+
+# Plays the quiz in the terminal against a server
+async def play_in_terminal(host, port):
+    client = await QuizClient(host, port).connect()
+
+    response = await client.start(input("Enter your username: "))
+
+    while "question" in response:
+        question = response["question"]
+
+        print()
+        print("(" + str(response["number"]) + "/" + str(response["count"]) + ") " + question["text"])
+
+        if question["question_type"] == 3:
+            result = await client.submit_typed(input("> "))
+        else:
+            for answer_index in range(0, len(question["possible"])):
+                print("  " + str(answer_index + 1) + ". " + question["possible"][answer_index])
+
+            answers = input("Answer number(s), separated by spaces: ").split()
+            result = await client.submit([int(answer) - 1 for answer in answers if answer.isdigit()])
+
+        if "error" in result:
+            print(result["error"])
+
+            continue
+
+        print(result["correct"] and "Correct!" or "Incorrect (" + ", ".join(result["correct_answers"]) + ")")
+
+        response = await client.next()
+
+    print()
+    print("You got " + str(response.get("score")) + "/" + str(response.get("count")) + "!")
+
+    await client.close()
+
+
+if __name__ == '__main__':
+    arguments = sys.argv[1:]
+
+    if arguments and arguments[0] == "client":
+        asyncio.run(play_in_terminal(len(arguments) > 1 and arguments[1] or DEFAULT_HOST,
+                                     len(arguments) > 2 and int(arguments[2]) or DEFAULT_PORT))
+    else:
+        quiz_server = QuizServer(QuestionBank(), len(arguments) > 0 and arguments[0] or DEFAULT_HOST,
+                                 len(arguments) > 1 and int(arguments[1]) or DEFAULT_PORT)
+
+        try:
+            asyncio.run(quiz_server.serve_forever())
+        except KeyboardInterrupt:
+            pass
@@ -0,0 +1,132 @@
+import json
+import struct
+from collections import OrderedDict
+
+# A saved result format that can be read one question at a time. A result (refer to quiz_engine.py) is stored as:
+#   - a header: magic, version and how many questions there are
+#   - an offset table: where each question's data starts, plus where the last one ends (counted from the table's end)
+#   - each question's answers as its own piece of UTF-8 JSON, one after another
+#
+# So a viewer only has to read the header and offset table, then it can seek straight to the question it's showing and
+# decode just that one. Results saved as one big JSON list (like the original .sav files) still load, they're just
+# decoded all at once.
+
+MAGIC = b"QRES"
+VERSION = 1
+
+# Magic, version, question count
+HEADER = struct.Struct("<4sII")
+OFFSET = struct.Struct("<I")
+
+
+# Turns a result into the seekable format
+def encode_result(result):
+    questions = [json.dumps(question).encode("utf-8") for question in result]
+
+    offsets = [0]
+    for question in questions:
+        offsets.append(offsets[-1] + len(question))
+
+    return (HEADER.pack(MAGIC, VERSION, len(questions)) + struct.pack("<" + str(len(offsets)) + "I", *offsets) +
+            b"".join(questions))
+
+
+# Checks whether saved data is in the seekable format (rather than one JSON list)
+def is_encoded_result(data):
+    return isinstance(data, bytes) and data[0:len(MAGIC)] == MAGIC
+
+
+# Gets the question count and offset table out of the start of some encoded data. read_range(position, size) reads
+# bytes from the encoded data
+def read_offsets(read_range):
+    magic, version, question_count = HEADER.unpack(read_range(0, HEADER.size))
+
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not a saved result (or it was saved by a newer version of the quiz)")
+
+    table_size = (question_count + 1) * OFFSET.size
+
+    return list(struct.unpack("<" + str(question_count + 1) + "I", read_range(HEADER.size, table_size)))
+
+
+# Decodes a whole saved result, in either format
+def decode_result(data):
+    if not is_encoded_result(data):
+        return json.loads(data)
+
+    offsets = read_offsets(lambda position, size: data[position:position + size])
+    start = HEADER.size + len(offsets) * OFFSET.size
+
+    return [json.loads(data[start + offsets[i]:start + offsets[i + 1]]) for i in range(0, len(offsets) - 1)]
+
+
+# Reads the questions of a saved result as they're needed. Works like a (read only) list of the result's answers, and
+# keeps the last few decoded questions around so going back and forward between questions doesn't decode them again
+class ResultReader:
+    CACHE_SIZE = 8
+
+    def __init__(self, question_count):
+        self.question_count = question_count
+
+        # Question index -> the decoded question, least recently used first
+        self.cache = OrderedDict()
+
+    def __len__(self):
+        return self.question_count
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.question_count
+
+        if index < 0 or index >= self.question_count:
+            raise IndexError("Question " + str(index) + " is not in the result")
+
+        question = self.cache.get(index)
+
+        if question is None:
+            question = self.read_question(index)
+
+            self.cache[index] = question
+
+            if len(self.cache) > self.CACHE_SIZE:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(index)
+
+        return question
+
+    def __iter__(self):
+        for index in range(0, self.question_count):
+            yield self[index]
+
+    # Reads and decodes one question
+    def read_question(self, index):
+        raise NotImplementedError
+
+
+# A reader for a result that's already been decoded as a whole (like an old JSON result)
+class ListResultReader(ResultReader):
+    def __init__(self, result):
+        super().__init__(len(result))
+
+        self.result = result
+
+    def read_question(self, index):
+        return self.result[index]
+
+
+# A reader for a result in the seekable format. read_range(position, size) reads bytes from the encoded data, which
+# could be a file, a database blob or anything else
+class EncodedResultReader(ResultReader):
+    def __init__(self, read_range):
+        self.read_range = read_range
+
+        self.offsets = read_offsets(read_range)
+        self.data_start = HEADER.size + len(self.offsets) * OFFSET.size
+
+        super().__init__(len(self.offsets) - 1)
+
+    def read_question(self, index):
+        start = self.offsets[index]
+
+        return json.loads(self.read_range(self.data_start + start, self.offsets[index + 1] - start))
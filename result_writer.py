@@ -0,0 +1,131 @@
+import queue
+import threading
+
+import metrics
+
+# Saves results on a background thread, so finishing a quiz never waits on the disk. Saves are queued up, and the
+# worker thread saves everything that's waiting in one batch (refer to save_results in results_store.py).
+#
+# Tk isn't thread safe, so callbacks aren't run on the worker thread. Once a save is done its callback waits in a queue
+# until poll is called from the main thread (the quiz calls it from Tk's after loop)
+
+
+# A result waiting to be saved
+class ResultJob:
+    __slots__ = ("username", "date", "result", "callback", "attempt", "error")
+
+    def __init__(self, username, date, result, callback):
+        self.username = username
+        self.date = date
+        self.result = result
+
+        self.callback = callback
+
+        self.attempt = None
+        self.error = None
+
+
+class ResultWriter:
+    def __init__(self, store, batch_size=16):
+        self.store = store
+        self.batch_size = batch_size
+
+        self.jobs = queue.Queue()
+        self.finished_jobs = queue.Queue()
+
+        self.pending_count = 0
+        self.pending_lock = threading.Lock()
+
+        self.thread = threading.Thread(target=self.run, name="ResultWriter", daemon=True)
+        self.thread.start()
+
+    # Queues a result to be saved. The callback gets the saved Attempt and the error (if saving failed)
+    def save(self, username, date, result, callback=None):
+        with self.pending_lock:
+            self.pending_count += 1
+
+        self.jobs.put(ResultJob(username, date, result, callback))
+
+    # Checks whether any results are still waiting to be saved
+    def is_busy(self):
+        return self.pending_count > 0
+
+    # The worker thread. Waits for a job, then saves it along with any other jobs that are already waiting
+    def run(self):
+        while True:
+            job = self.jobs.get()
+
+            if job is None:
+                return
+
+            batch = [job]
+            stopping = False
+
+            while len(batch) < self.batch_size:
+                try:
+                    job = self.jobs.get_nowait()
+                except queue.Empty:
+                    break
+
+                if job is None:
+                    stopping = True
+
+                    break
+
+                batch.append(job)
+
+            self.save_batch(batch)
+
+            if stopping:
+                return
+
+    # Saves a batch of jobs. If the batch fails as a whole, each job is tried on its own so one bad result can't stop
+    # the others from being saved
+    def save_batch(self, batch):
+        try:
+            attempts = self.write_batch(batch)
+
+            for i in range(0, len(batch)):
+                batch[i].attempt = attempts[i]
+        except Exception as error:
+            if len(batch) == 1:
+                batch[0].error = error
+            else:
+                for job in batch:
+                    self.save_batch([job])
+
+                return
+
+        with self.pending_lock:
+            self.pending_count -= len(batch)
+
+        for job in batch:
+            if job.error:
+                print("Couldn't save the result for " + job.username + ": " + str(job.error))
+
+            self.finished_jobs.put(job)
+
+    # Writes a batch of jobs to the store, giving back their saved attempts
+    @metrics.timed("result_save")
+    def write_batch(self, batch):
+        return self.store.save_results([(job.username, job.date, job.result) for job in batch])
+
+    # Runs the callbacks of any finished saves. This needs to be called from the main thread
+    def poll(self):
+        while True:
+            try:
+                job = self.finished_jobs.get_nowait()
+            except queue.Empty:
+                return
+
+            if job.callback:
+                job.callback(job.attempt, job.error)
+
+    # Waits for every queued result to be saved, then stops the worker thread. The callbacks of the last saves are run
+    # unless run_callbacks is False (for when the window they'd update is going away, failed saves are still printed)
+    def close(self, timeout=None, run_callbacks=True):
+        self.jobs.put(None)
+        self.thread.join(timeout)
+
+        if run_callbacks:
+            self.poll()
@@ -0,0 +1,811 @@
+import json
+import os
+import sqlite3
+import struct
+import threading
+from datetime import datetime
+from result_format import EncodedResultReader, ListResultReader, decode_result, encode_result
+
+# Where quiz results get saved. Every store has the same methods, so the quiz doesn't care which one it's using:
+#   - FileResultsStore is the original format, one JSON .sav file per attempt in a folder per user
+#   - SqliteResultsStore keeps every attempt in one SQLite database, indexed by user and time
+#
+# A result is the list of answers a QuizSession collects (refer to quiz_engine.py). Results can be loaded as a whole
+# with load_result, or opened with open_result to read them a question at a time (refer to result_format.py).
+
+# What the quiz calls its SQLite database, in its main folder
+DATABASE_FILE_NAME = "results.sqlite3"
+
+# What the SQLite store remembers once the .sav results have been imported into it
+SAV_IMPORT_KEY = "imported_sav_results"
+
+# The most answers a result can have, since attempt indexes store scores and question counts in 16 bits
+MAX_RESULT_ANSWERS = 65535
+
+
+# Gets the score of a result (how many answers were correct)
+def get_result_score(result):
+    return sum(1 for answer in result if answer[2])
+
+
+# Formats an attempt's date the way the summary menu shows it, e.g. 05/06/2023 - 02:07:09 PM
+def format_attempt_date(date):
+    hour = date.hour
+    if hour > 12:
+        hour -= 12
+
+    return (str(date.day).zfill(2) + "/" + str(date.month).zfill(2) + "/" + str(date.year).zfill(2) + " - " +
+            str(hour).zfill(2) + ":" + str(date.minute).zfill(2) + ":" + str(date.second).zfill(2) + " " +
+            (date.hour > 11 and "PM" or "AM"))
+
+
+# A saved attempt at the quiz. key is whatever the store uses to find the attempt again
+class Attempt:
+    __slots__ = ("key", "username", "date", "score", "question_count", "size")
+
+    def __init__(self, key, username, date, score=None, question_count=None, size=None):
+        self.key = key
+        self.username = username
+        self.date = date
+
+        self.score = score
+        self.question_count = question_count
+
+        # How many bytes the saved answers take up
+        self.size = size
+
+    # Gets the name shown for the attempt in the summary menu
+    def get_display_name(self):
+        return format_attempt_date(self.date)
+
+
+# A function that grabs the date from an attempt, for sorting
+def get_attempt_date(attempt):
+    return attempt.date
+
+
+# The methods every results store has
+class ResultsStore:
+    # Saves an attempt and gives back its Attempt
+    def save_result(self, username, date, result):
+        raise NotImplementedError
+
+    # Saves a lot of attempts at once. Takes (username, date, result) tuples and gives back their Attempts
+    def save_results(self, results):
+        return [self.save_result(username, date, result) for username, date, result in results]
+
+    # Replaces the answers of an attempt that's already been saved (like after re-grading it)
+    def update_result(self, attempt, result):
+        self.update_results([(attempt, result)])
+
+    # Replaces the answers of a lot of attempts at once. Takes (attempt, result) tuples
+    def update_results(self, results):
+        raise NotImplementedError
+
+    # Gets a user's attempts, newest first. start and count pick out a page of them (count None means all of them), and
+    # first_date and end_date only include attempts from first_date up to (but not including) end_date
+    def list_attempts(self, username, start=0, count=None, first_date=None, end_date=None):
+        raise NotImplementedError
+
+    # Gets how many attempts a user has (from first_date up to end_date, if they're given)
+    def count_attempts(self, username, first_date=None, end_date=None):
+        return len(self.list_attempts(username, first_date=first_date, end_date=end_date))
+
+    # Loads the answers of an attempt
+    def load_result(self, attempt):
+        raise NotImplementedError
+
+    # Opens the answers of an attempt to be read a question at a time. Gives back a ResultReader
+    def open_result(self, attempt):
+        return ListResultReader(self.load_result(attempt))
+
+    # Gets every user that has saved attempts
+    def list_usernames(self):
+        raise NotImplementedError
+
+    # Gets how many attempts a user has, their total score and the total amount of questions they've answered (from
+    # first_date up to end_date, if they're given)
+    def get_user_totals(self, username, first_date=None, end_date=None):
+        attempts = 0
+        score = 0
+        question_count = 0
+
+        for attempt in self.list_attempts(username, first_date=first_date, end_date=end_date):
+            if attempt.score is None:
+                result = self.load_result(attempt)
+
+                attempt.score = get_result_score(result)
+                attempt.question_count = len(result)
+
+            attempts += 1
+            score += attempt.score
+            question_count += attempt.question_count
+
+        return attempts, score, question_count
+
+    def close(self):
+        pass
+
+
+# Remembers which users have saved attempts, so checking a username (like on every key press in the start screen) never
+# has to ask the store. The usernames are loaded on a background thread, and kept up to date by adding users as their
+# results get saved. They're loaded again whenever the main menu is shown, since results can also be saved or removed
+# by something else (like batch_grading.py, the quiz server or deleting a user's folder)
+class UsernameCache:
+    def __init__(self, store):
+        self.store = store
+
+        self.usernames = set()
+        self.lock = threading.Lock()
+
+        # Users that were added since the last load started
+        self.added_usernames = set()
+
+        self.loaded = threading.Event()
+
+    # Starts (re)loading the usernames from the store in the background. The usernames from the last load are still used
+    # until it's done
+    def refresh(self):
+        with self.lock:
+            self.added_usernames = set()
+
+        self.loaded.clear()
+
+        threading.Thread(target=self.load, name="UsernameCache", daemon=True).start()
+
+    def load(self):
+        try:
+            usernames = set(self.store.list_usernames())
+        except Exception as error:
+            print("Couldn't load the saved usernames: " + str(error))
+
+            usernames = set()
+
+        with self.lock:
+            # Keeps any users that were added while loading
+            self.usernames = usernames | self.added_usernames
+
+        self.loaded.set()
+
+    def is_loaded(self):
+        return self.loaded.is_set()
+
+    def add(self, username):
+        with self.lock:
+            self.usernames.add(username)
+            self.added_usernames.add(username)
+
+    def contains(self, username):
+        with self.lock:
+            return username in self.usernames
+
+
+# Turns a .sav file name (d_m_y-h_m_s.sav) back into its date
+def get_file_name_date(file_name):
+    date, time = file_name.replace(".sav", "").split("-")
+    day, month, year = date.split("_")
+    hour, minute, second = time.split("_")
+
+    return datetime(int(year), int(month), int(day), int(hour), int(minute), int(second))
+
+
+# Reads the result saved in a .sav file. Raises ValueError if the file doesn't hold a result (like one that was edited
+# by hand or only partly written)
+def read_sav_file(path):
+    with open(path, "r") as data:
+        result = json.loads(data.readline())
+
+    if not isinstance(result, list) or len(result) > MAX_RESULT_ANSWERS:
+        raise ValueError("it doesn't hold a saved result")
+
+    # Every version of the quiz saved at least the question text, question type and whether it was correct
+    for answer in result:
+        if not isinstance(answer, list) or len(answer) < 3:
+            raise ValueError("it doesn't hold a saved result")
+
+    return result
+
+
+# Makes the .sav file name for a date
+def get_date_file_name(date):
+    return (str(date.day) + "_" + str(date.month) + "_" + str(date.year) + "-" + str(date.hour) + "_" +
+            str(date.minute) + "_" + str(date.second) + ".sav")
+
+
+# Makes sure a folder's entries (like a renamed file) are on disk. Folders can't be opened for this on Windows, so it's
+# skipped there
+def sync_folder(path):
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+
+    folder = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(folder)
+    finally:
+        os.close(folder)
+
+
+# A per user index of attempt metadata, saved next to their .sav files. Every attempt is one fixed size record (date,
+# score, question count and file size), so a page of attempts can be read straight out of the index without listing
+# the folder, parsing file names or opening any results. Records are appended as results are saved, in date order.
+#
+# The index remembers the folder's modification time from when it was last written. If the folder has changed since
+# (like results saved by an older version of the quiz), the index is rebuilt from the folder
+class AttemptIndex:
+    MAGIC = b"AIDX"
+    VERSION = 1
+
+    # Magic, version, the folder's modification time (ns)
+    HEADER = struct.Struct("<4sIq")
+
+    # Year, month, day, hour, minute, second, score, question count, file size
+    RECORD = struct.Struct("<HBBBBBxHHQ")
+
+    FILE_NAME = "attempts.idx"
+
+    def __init__(self, user_path, username):
+        self.user_path = user_path
+        self.username = username
+
+        self.path = os.path.join(user_path, self.FILE_NAME)
+
+    # Turns an attempt into an index record
+    def pack_attempt(self, attempt):
+        date = attempt.date
+
+        return self.RECORD.pack(date.year, date.month, date.day, date.hour, date.minute, date.second,
+                                attempt.score, attempt.question_count, attempt.size)
+
+    # Turns an index record back into an attempt
+    def unpack_attempt(self, record):
+        year, month, day, hour, minute, second, score, question_count, size = self.RECORD.unpack(record)
+        date = datetime(year, month, day, hour, minute, second)
+
+        return Attempt(os.path.join(self.user_path, get_date_file_name(date)), self.username, date, score,
+                       question_count, size)
+
+    # Checks whether the index exists and still matches the folder
+    def is_current(self):
+        try:
+            with open(self.path, "rb") as index:
+                header = index.read(self.HEADER.size)
+        except OSError:
+            return False
+
+        if len(header) != self.HEADER.size:
+            return False
+
+        magic, version, folder_modified = self.HEADER.unpack(header)
+
+        return (magic == self.MAGIC and version == self.VERSION and
+                folder_modified == os.stat(self.user_path).st_mtime_ns)
+
+    # Rewrites the folder's modification time into the header, after the index has been written
+    def stamp(self, index):
+        index.seek(0)
+        index.write(self.HEADER.pack(self.MAGIC, self.VERSION, os.stat(self.user_path).st_mtime_ns))
+
+    # Rebuilds the index by reading every result in the folder. Files that don't hold a result are left out
+    def rebuild(self):
+        attempts = []
+
+        for file in os.scandir(self.user_path):
+            if not file.name.endswith(".sav"):
+                continue
+
+            try:
+                date = get_file_name_date(file.name)
+                result = read_sav_file(file.path)
+            except (ValueError, OSError) as error:
+                print("Skipping " + file.path + ", " + str(error))
+
+                continue
+
+            attempts.append(Attempt(file.path, self.username, date, get_result_score(result), len(result),
+                                    file.stat().st_size))
+
+        attempts.sort(key=get_attempt_date)
+
+        temp_path = self.path + ".tmp"
+        with open(temp_path, "wb") as index:
+            index.write(self.HEADER.pack(self.MAGIC, self.VERSION, 0))
+
+            for attempt in attempts:
+                index.write(self.pack_attempt(attempt))
+
+        os.replace(temp_path, self.path)
+
+        # Replacing the index changes the folder's modification time, so the stamp has to come afterwards
+        with open(self.path, "r+b") as index:
+            self.stamp(index)
+
+    # Makes sure the index is usable, rebuilding it if it isn't
+    def update(self):
+        if not self.is_current():
+            self.rebuild()
+
+    # Adds newly saved attempts to the end of the index. The index needs to have been current before they were saved
+    def append(self, attempts):
+        with open(self.path, "r+b") as index:
+            index.seek(0, os.SEEK_END)
+
+            for attempt in attempts:
+                index.write(self.pack_attempt(attempt))
+
+            self.stamp(index)
+
+    def count(self):
+        return (os.path.getsize(self.path) - self.HEADER.size) // self.RECORD.size
+
+    # Reads the date of the record at a position
+    def read_date(self, index, position):
+        index.seek(self.HEADER.size + position * self.RECORD.size)
+
+        return datetime(*self.RECORD.unpack(index.read(self.RECORD.size))[0:6])
+
+    # Finds the first position whose date is at or after the given date. Records are in date order, so this is a binary
+    # search
+    def find_position(self, index, date):
+        low = 0
+        high = self.count()
+
+        while low < high:
+            middle = (low + high) // 2
+            middle_date = self.read_date(index, middle)
+
+            if middle_date < date:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
+
+    # Gets the range of positions from first_date up to (but not including) end_date. Either date can be None for no
+    # limit
+    def find_range(self, first_date=None, end_date=None):
+        with open(self.path, "rb") as index:
+            # A position of 0 is a real bound (every attempt is after it), so it can't be picked with and/or
+            first = self.find_position(index, first_date) if first_date else 0
+            end = self.find_position(index, end_date) if end_date else self.count()
+
+        return first, max(first, end)
+
+    # Counts the attempts between two dates
+    def count_range(self, first_date=None, end_date=None):
+        first, end = self.find_range(first_date, end_date)
+
+        return end - first
+
+    # Reads a page of attempts, newest first, optionally only ones between two dates
+    def read(self, start=0, count=None, first_date=None, end_date=None):
+        lowest, end = self.find_range(first_date, end_date)
+
+        end -= start
+        first = lowest
+        if count is not None:
+            first = max(lowest, end - count)
+
+        if end <= first:
+            return []
+
+        with open(self.path, "rb") as index:
+            index.seek(self.HEADER.size + first * self.RECORD.size)
+            data = index.read((end - first) * self.RECORD.size)
+
+        attempts = [self.unpack_attempt(data[i * self.RECORD.size:(i + 1) * self.RECORD.size])
+                    for i in range(0, end - first)]
+        attempts.reverse()
+
+        return attempts
+
+
+# The original results format: <main_path>/<username>/<d_m_y-h_m_s>.sav, each holding one line of JSON.
+#
+# Files are written to a temporary file first and renamed over the real one, so a result file is never left half
+# written. With fsync on, files are also forced onto the disk before being renamed (one folder sync per batch of saves).
+#
+# Attempts are listed from each user's AttemptIndex, which is kept up to date as results are saved
+class FileResultsStore(ResultsStore):
+    def __init__(self, main_path, fsync=False):
+        self.main_path = main_path
+        self.fsync = fsync
+
+        # Results can be saved from a background thread while the index is being read
+        self.lock = threading.RLock()
+
+    # Gets the folder a user's results are saved in
+    def get_user_path(self, username):
+        return os.path.join(self.main_path, username)
+
+    # Gets a user's attempt index, or None if they don't have any results
+    def get_index(self, username):
+        user_path = self.get_user_path(username)
+
+        if not os.path.isdir(user_path):
+            return
+
+        index = AttemptIndex(user_path, username)
+        index.update()
+
+        return index
+
+    # Writes a result to a temporary file next to where it's going, and gives back both paths
+    def write_temp_file(self, username, date, result):
+        user_path = self.get_user_path(username)
+
+        if not os.path.isdir(user_path):
+            os.makedirs(user_path)
+
+        file_path = os.path.join(user_path, get_date_file_name(date))
+        temp_path = file_path + ".tmp"
+
+        with open(temp_path, "w") as data:
+            data.write(json.dumps(result))
+
+            if self.fsync:
+                data.flush()
+                os.fsync(data.fileno())
+
+            size = data.tell()
+
+        return file_path, temp_path, size
+
+    def save_result(self, username, date, result):
+        return self.save_results([(username, date, result)])[0]
+
+    def save_results(self, results):
+        attempts = []
+
+        # Username -> (their index, whether it was up to date before saving, the attempts saved for them)
+        user_attempts = {}
+
+        with self.lock:
+            for username, date, result in results:
+                if username not in user_attempts:
+                    index = AttemptIndex(self.get_user_path(username), username)
+
+                    # Saving changes the folder, so this has to be checked first
+                    user_attempts[username] = (index, os.path.isdir(index.user_path) and index.is_current(), [])
+
+                file_path, temp_path, size = self.write_temp_file(username, date, result)
+
+                os.replace(temp_path, file_path)
+
+                attempt = Attempt(file_path, username, date, get_result_score(result), len(result), size)
+
+                attempts.append(attempt)
+                user_attempts[username][2].append(attempt)
+
+            for index, was_current, new_attempts in user_attempts.values():
+                if self.fsync:
+                    sync_folder(index.user_path)
+
+                if was_current:
+                    index.append(new_attempts)
+                else:
+                    index.rebuild()
+
+        return attempts
+
+    def update_results(self, results):
+        usernames = set()
+
+        with self.lock:
+            for attempt, result in results:
+                file_path, temp_path, size = self.write_temp_file(attempt.username, attempt.date, result)
+
+                os.replace(temp_path, file_path)
+
+                attempt.score = get_result_score(result)
+                attempt.question_count = len(result)
+                attempt.size = size
+
+                usernames.add(attempt.username)
+
+            # Scores are kept in the index, so it's rebuilt once for every user that had results updated
+            for username in usernames:
+                index = AttemptIndex(self.get_user_path(username), username)
+
+                if self.fsync:
+                    sync_folder(index.user_path)
+
+                index.rebuild()
+
+    def list_attempts(self, username, start=0, count=None, first_date=None, end_date=None):
+        with self.lock:
+            index = self.get_index(username)
+
+            return index and index.read(start, count, first_date, end_date) or []
+
+    def count_attempts(self, username, first_date=None, end_date=None):
+        with self.lock:
+            index = self.get_index(username)
+
+            return index and index.count_range(first_date, end_date) or 0
+
+    def load_result(self, attempt):
+        return read_sav_file(attempt.key)
+
+    def list_usernames(self):
+        if not os.path.isdir(self.main_path):
+            return []
+
+        return [folder.name for folder in os.scandir(self.main_path) if folder.is_dir()]
+
+
+# Keeps every attempt in one SQLite database. Attempts are indexed by user and time, so listing a user's attempts is an
+# index lookup, and scores are stored alongside the answers so totals never need to load any answers.
+#
+# Answers are saved in the seekable result format (refer to result_format.py), so open_result only reads the part of
+# the blob that's needed. Attempts saved as JSON text by older versions still load.
+#
+# Saves can be batched: up to batch_size attempts are held back and inserted in one transaction. Reading from the
+# store always writes any held back attempts first
+class SqliteResultsStore(ResultsStore):
+    def __init__(self, database_path, batch_size=1):
+        self.database_path = database_path
+        self.batch_size = batch_size
+
+        self.pending = []
+
+        # check_same_thread is off so results can be written from a background thread. The lock makes sure only one
+        # thread uses the connection at a time
+        self.lock = threading.RLock()
+        self.connection = sqlite3.connect(database_path, check_same_thread=False)
+
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+
+        self.connection.execute("CREATE TABLE IF NOT EXISTS attempts ("
+                                "id INTEGER PRIMARY KEY, "
+                                "username TEXT NOT NULL, "
+                                "created TEXT NOT NULL, "
+                                "score INTEGER NOT NULL, "
+                                "question_count INTEGER NOT NULL, "
+                                "data TEXT NOT NULL)")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS attempts_by_user ON attempts (username, created)")
+
+        # Things the store needs to remember about itself, like whether the old results have been imported
+        self.connection.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        self.connection.commit()
+
+    def save_result(self, username, date, result):
+        data = encode_result(result)
+        attempt = Attempt(None, username, date, get_result_score(result), len(result), len(data))
+
+        with self.lock:
+            self.pending.append((attempt, data))
+
+            if len(self.pending) >= self.batch_size:
+                self.flush()
+
+        return attempt
+
+    # Saves a lot of attempts in one transaction
+    def save_results(self, results):
+        attempts = []
+        rows = []
+
+        for username, date, result in results:
+            data = encode_result(result)
+            attempt = Attempt(None, username, date, get_result_score(result), len(result), len(data))
+
+            attempts.append(attempt)
+            rows.append((attempt, data))
+
+        with self.lock:
+            self.pending.extend(rows)
+            self.flush()
+
+        return attempts
+
+    # Inserts any held back attempts. If the insert fails the held back attempts are dropped (and the error is raised)
+    def flush(self):
+        with self.lock:
+            if not self.pending:
+                return
+
+            pending = self.pending
+            self.pending = []
+
+            with self.connection:
+                for attempt, data in pending:
+                    self.insert_attempt(attempt, data)
+
+    # Inserts an attempt and sets its key. Needs to be run inside a transaction
+    def insert_attempt(self, attempt, data):
+        cursor = self.connection.execute(
+            "INSERT INTO attempts (username, created, score, question_count, data) VALUES (?, ?, ?, ?, ?)",
+            (attempt.username, attempt.date.isoformat(), attempt.score, attempt.question_count, data))
+        attempt.key = cursor.lastrowid
+
+    # Gets a value from the meta table, or None if it isn't set
+    def get_meta(self, key):
+        with self.lock:
+            row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+
+        return row and row[0]
+
+    # Replaces the answers of saved attempts in one transaction
+    def update_results(self, results):
+        with self.lock:
+            self.flush()
+
+            with self.connection:
+                for attempt, result in results:
+                    data = encode_result(result)
+
+                    attempt.score = get_result_score(result)
+                    attempt.question_count = len(result)
+                    attempt.size = len(data)
+
+                    self.connection.execute("UPDATE attempts SET score = ?, question_count = ?, data = ? WHERE id = ?",
+                                            (attempt.score, attempt.question_count, data, attempt.key))
+
+    # Makes the SQL condition and parameters for picking a user's attempts from first_date up to (but not including)
+    # end_date
+    @staticmethod
+    def get_attempt_filter(username, first_date, end_date):
+        condition = "username = ?"
+        parameters = [username]
+
+        if first_date:
+            condition += " AND created >= ?"
+            parameters.append(first_date.isoformat())
+
+        if end_date:
+            condition += " AND created < ?"
+            parameters.append(end_date.isoformat())
+
+        return condition, parameters
+
+    def list_attempts(self, username, start=0, count=None, first_date=None, end_date=None):
+        condition, parameters = self.get_attempt_filter(username, first_date, end_date)
+
+        # A negative limit means no limit in SQLite
+        parameters += [count is None and -1 or count, start]
+
+        with self.lock:
+            self.flush()
+
+            return [Attempt(key, username, datetime.fromisoformat(created), score, question_count, size)
+                    for key, created, score, question_count, size in
+                    self.connection.execute("SELECT id, created, score, question_count, LENGTH(data) FROM attempts "
+                                            "WHERE " + condition + " ORDER BY created DESC LIMIT ? OFFSET ?",
+                                            parameters)]
+
+    def count_attempts(self, username, first_date=None, end_date=None):
+        condition, parameters = self.get_attempt_filter(username, first_date, end_date)
+
+        with self.lock:
+            self.flush()
+
+            return self.connection.execute("SELECT COUNT(*) FROM attempts WHERE " + condition, parameters).fetchone()[0]
+
+    def load_result(self, attempt):
+        with self.lock:
+            self.flush()
+
+            row = self.connection.execute("SELECT data FROM attempts WHERE id = ?", (attempt.key,)).fetchone()
+
+        if not row:
+            raise KeyError("Attempt " + str(attempt.key) + " doesn't exist")
+
+        return decode_result(row[0])
+
+    # Reads part of an attempt's answers
+    def read_result_range(self, attempt, position, size):
+        with self.lock:
+            row = self.connection.execute("SELECT SUBSTR(data, ?, ?) FROM attempts WHERE id = ?",
+                                          (position + 1, size, attempt.key)).fetchone()
+
+        if not row:
+            raise KeyError("Attempt " + str(attempt.key) + " doesn't exist")
+
+        return row[0]
+
+    def open_result(self, attempt):
+        with self.lock:
+            self.flush()
+
+            row = self.connection.execute("SELECT TYPEOF(data) FROM attempts WHERE id = ?", (attempt.key,)).fetchone()
+
+        if not row:
+            raise KeyError("Attempt " + str(attempt.key) + " doesn't exist")
+
+        # Older attempts were saved as one JSON list
+        if row[0] != "blob":
+            return ListResultReader(self.load_result(attempt))
+
+        return EncodedResultReader(lambda position, size: self.read_result_range(attempt, position, size))
+
+    def list_usernames(self):
+        with self.lock:
+            self.flush()
+
+            return [row[0] for row in self.connection.execute("SELECT DISTINCT username FROM attempts")]
+
+    def get_user_totals(self, username, first_date=None, end_date=None):
+        condition, parameters = self.get_attempt_filter(username, first_date, end_date)
+
+        with self.lock:
+            self.flush()
+
+            attempts, score, question_count = self.connection.execute(
+                "SELECT COUNT(*), TOTAL(score), TOTAL(question_count) FROM attempts WHERE " + condition,
+                parameters).fetchone()
+
+        return attempts, int(score), int(question_count)
+
+    # Copies every attempt from another store (like the old .sav files) into this one, and gives back how many were
+    # copied. Everything is copied in one transaction, so if anything fails nothing is copied (and the error is raised),
+    # apart from results that can't be loaded, which are skipped. If done_key is given it's set in the meta table in the
+    # same transaction, so it's only set once the whole import has finished. Attempts that are already in this store
+    # (the same user and time) are skipped
+    def import_results(self, store, done_key=None):
+        imported = 0
+
+        with self.lock:
+            self.flush()
+
+            with self.connection:
+                for username in store.list_usernames():
+                    existing_dates = {row[0] for row in self.connection.execute(
+                        "SELECT created FROM attempts WHERE username = ?", (username,))}
+
+                    for attempt in store.list_attempts(username):
+                        if attempt.date.isoformat() in existing_dates:
+                            continue
+
+                        try:
+                            result = store.load_result(attempt)
+                        except (ValueError, OSError) as error:
+                            print("Skipping " + username + "'s result from " + str(attempt.date) + ", " + str(error))
+
+                            continue
+
+                        data = encode_result(result)
+
+                        self.insert_attempt(Attempt(None, username, attempt.date, get_result_score(result), len(result),
+                                                    len(data)), data)
+                        imported += 1
+
+                if done_key:
+                    self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                                            (done_key, datetime.now().isoformat()))
+
+        return imported
+
+    def close(self):
+        with self.lock:
+            self.flush()
+            self.connection.close()
+
+
+# Imports the .sav results into a SqliteResultsStore on a background thread, since reading every saved result can take a
+# while. Until it's done the quiz keeps using the .sav results as they are (refer to poll_sav_import in main.py)
+class SavImport:
+    def __init__(self, file_store, store):
+        self.file_store = file_store
+        self.store = store
+
+        self.thread = None
+
+        self.imported = 0
+        self.error = None
+
+    # Starts importing. done_key is passed on to import_results
+    def start(self, done_key=None):
+        self.error = None
+
+        self.thread = threading.Thread(target=self.run, args=(done_key,), name="SavImport", daemon=True)
+        self.thread.start()
+
+    def run(self, done_key):
+        try:
+            self.imported += self.store.import_results(self.file_store, done_key)
+        except Exception as error:
+            self.error = error
+
+    def is_running(self):
+        return self.thread.is_alive()
@@ -0,0 +1,36 @@
+import random
+
+
+# Draws unique IDs from 0 to count - 1 one at a time using a partial Fisher-Yates shuffle. Only the positions that have
+# been swapped are stored, so drawing k IDs takes O(k) time and memory no matter how big count is
+class UniqueIdSampler:
+    def __init__(self, count, rng=random):
+        self.count = count
+        self.rng = rng
+
+        self.drawn = 0
+        self.swapped = {}
+
+    def __len__(self):
+        return self.count - self.drawn
+
+    # Draws the next unique ID, or None if every ID has been drawn
+    def draw(self):
+        if self.drawn >= self.count:
+            return
+
+        # Swap a random position from the undrawn part of the (virtual) ID array into the drawn part
+        position = self.rng.randrange(self.drawn, self.count)
+
+        question_id = self.swapped.get(position, position)
+        self.swapped[position] = self.swapped.pop(self.drawn, self.drawn)
+
+        self.drawn += 1
+
+        return question_id
+
+
+# Draws amount unique IDs from 0 to count - 1 in one go. random.sample doesn't copy a range, so this is O(amount)
+def sample_ids(count, amount, rng=random):
+    return rng.sample(range(0, count), min(amount, count))
+
@@ -0,0 +1,84 @@
+import json
+import os
+
+import pytest
+
+import question_bank
+from question_bank import IN_MEMORY_BANK_BYTES, QuestionBank, get_index_path, is_index_current
+
+QUESTIONS = [
+    {"text": "What is 1 + 1?", "question_type": 1, "answer_type": 2, "possible": ["1", "2"], "correct": [1]},
+    {"text": "Which are even?", "question_type": 2, "answer_type": 1, "possible": ["2", "3", "4"], "correct": [0, 2]},
+    {"text": "Type 'yes'", "question_type": 3, "answer_type": 1, "possible": ["yes"], "correct": [0]}
+]
+
+
+def write_bank(path, questions=QUESTIONS):
+    with open(path, "w", encoding="utf-8") as bank:
+        for question in questions:
+            bank.write(json.dumps(question) + "\n\n")
+
+    return str(path)
+
+
+@pytest.mark.parametrize("in_memory_bytes", [0, IN_MEMORY_BANK_BYTES])
+def test_questions_are_loaded_by_id(tmp_path, in_memory_bytes):
+    bank = QuestionBank(write_bank(tmp_path / "bank.jsonl"), in_memory_bytes)
+
+    assert (bank.table is not None) == (in_memory_bytes > 0)
+    assert len(bank) == len(QUESTIONS)
+    assert [question.question_text for question in bank] == [question["text"] for question in QUESTIONS]
+    assert bank[1].correct == ["2", "4"]
+    assert bank[2].id == 2
+
+    with pytest.raises(IndexError):
+        bank.get_question(len(QUESTIONS))
+
+    bank.close()
+
+
+def test_touched_bank_is_only_hashed_once(tmp_path, monkeypatch):
+    bank_path = write_bank(tmp_path / "bank.jsonl")
+    QuestionBank(bank_path, 0).close()
+
+    os.utime(bank_path, ns=(1, 1))
+
+    hashes = []
+    get_bank_hash = question_bank.get_bank_hash
+    monkeypatch.setattr(question_bank, "get_bank_hash", lambda path: hashes.append(path) or get_bank_hash(path))
+
+    for i in range(0, 3):
+        assert is_index_current(bank_path, get_index_path(bank_path))
+
+    assert len(hashes) == 1
+
+
+def test_same_size_edit_is_noticed(tmp_path):
+    bank_path = write_bank(tmp_path / "bank.jsonl")
+    QuestionBank(bank_path, 0).close()
+
+    edited = [dict(question) for question in QUESTIONS]
+    edited[0]["text"] = "What is 2 + 0?"
+    write_bank(bank_path, edited)
+
+    assert not is_index_current(bank_path, get_index_path(bank_path))
+
+    bank = QuestionBank(bank_path, 0)
+    assert bank[0].question_text == "What is 2 + 0?"
+    bank.close()
+
+
+@pytest.mark.parametrize("in_memory_bytes", [0, IN_MEMORY_BANK_BYTES])
+def test_built_questions_are_cached(tmp_path, in_memory_bytes):
+    bank = QuestionBank(write_bank(tmp_path / "bank.jsonl"), in_memory_bytes, cache_size=2)
+
+    first = bank[0]
+    assert bank[0] is first
+
+    bank[1]
+    bank[2]
+    assert len(bank.cache) == 2
+    assert bank[0] is not first
+    assert bank[0].question_text == first.question_text
+
+    bank.close()
@@ -0,0 +1,56 @@
+import json
+
+import pytest
+
+from result_format import EncodedResultReader, ListResultReader, decode_result, encode_result, is_encoded_result
+
+RESULT = [["What is 1 + 1?", 1, True, ["1", "2"], ["2"], [], ["2"]],
+          ["Which are even?", 2, False, ["2", "3", "4"], ["2"], ["4"], ["2", "4"]],
+          ["Type 'héllo'", 3, True, ["héllo"], ["héllo"], [], ["héllo"]]]
+
+
+@pytest.mark.parametrize("result", [RESULT, RESULT[:1], []])
+def test_round_trip(result):
+    data = encode_result(result)
+
+    assert is_encoded_result(data)
+    assert decode_result(data) == result
+
+
+def test_old_json_results_still_decode():
+    data = json.dumps(RESULT)
+
+    assert not is_encoded_result(data)
+    assert decode_result(data) == RESULT
+
+
+def test_encoded_reader_reads_only_what_it_needs():
+    data = encode_result(RESULT)
+    reads = []
+
+    def read_range(position, size):
+        reads.append((position, size))
+
+        return data[position:position + size]
+
+    reader = EncodedResultReader(read_range)
+    assert len(reader) == len(RESULT)
+
+    opened_reads = len(reads)
+    assert reader[-1] == RESULT[-1]
+    assert reader[-1] == RESULT[-1]
+    assert len(reads) == opened_reads + 1
+
+    assert list(reader) == RESULT
+    assert list(ListResultReader(RESULT)) == RESULT
+
+    with pytest.raises(IndexError):
+        reader[len(RESULT)]
+
+
+def test_newer_versions_are_rejected():
+    data = bytearray(encode_result(RESULT))
+    data[4] += 1
+
+    with pytest.raises(ValueError):
+        decode_result(bytes(data))
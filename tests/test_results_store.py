@@ -0,0 +1,98 @@
+import json
+import os
+from datetime import datetime
+
+import pytest
+
+from results_store import SAV_IMPORT_KEY, FileResultsStore, SqliteResultsStore, get_date_file_name
+
+RESULT = [["What is 1 + 1?", ["1", "2"], True, [1], [1], 1, ["2"]]]
+
+DATES = [datetime(2023, 3, 5, 12, 0, 0), datetime(2023, 3, 6, 0, 0, 0), datetime(2023, 3, 6, 23, 59, 59),
+         datetime(2023, 3, 7, 0, 0, 0), datetime(2023, 3, 8, 9, 30, 0), datetime(2023, 3, 9, 18, 15, 0)]
+
+
+@pytest.fixture(params=["file", "sqlite"])
+def store(request, tmp_path):
+    if request.param == "file":
+        store = FileResultsStore(str(tmp_path))
+    else:
+        store = SqliteResultsStore(str(tmp_path / "results.sqlite3"))
+
+    store.save_results([("bob", date, RESULT) for date in DATES])
+
+    yield store
+
+    store.close()
+
+
+@pytest.mark.parametrize("first_date, end_date, expected", [
+    (None, None, DATES),
+    (None, datetime(2023, 3, 1), []),
+    (datetime(2023, 4, 1), None, []),
+    (datetime(2023, 3, 1), datetime(2023, 3, 2), []),
+    (datetime(2023, 3, 6), datetime(2023, 3, 6), []),
+    (datetime(2023, 3, 7), datetime(2023, 3, 6), []),
+    (datetime(2023, 3, 6), datetime(2023, 3, 7), DATES[1:3]),
+    (None, datetime(2023, 3, 7), DATES[0:3]),
+    (datetime(2023, 3, 7), None, DATES[3:]),
+    (datetime(2023, 1, 1), datetime(2024, 1, 1), DATES)
+])
+def test_date_filter(store, first_date, end_date, expected):
+    assert store.count_attempts("bob", first_date, end_date) == len(expected)
+    assert [attempt.date for attempt in store.list_attempts("bob", 0, None, first_date, end_date)] == expected[::-1]
+
+
+@pytest.mark.parametrize("start, count, expected", [
+    (0, 2, DATES[:-3:-1]),
+    (2, 2, DATES[3:1:-1]),
+    (4, 10, DATES[1::-1]),
+    (6, 2, []),
+    (1, None, DATES[-2::-1])
+])
+def test_paging(store, start, count, expected):
+    assert [attempt.date for attempt in store.list_attempts("bob", start, count)] == expected
+
+
+def test_saved_results_load_back(store):
+    attempt = store.list_attempts("bob", 0, 1)[0]
+
+    assert store.load_result(attempt) == RESULT
+    assert list(store.open_result(attempt)) == RESULT
+
+
+def test_unknown_user(store):
+    assert store.count_attempts("alice") == 0
+    assert store.list_attempts("alice") == []
+
+
+def test_import_skips_files_that_are_not_results(tmp_path):
+    file_store = FileResultsStore(str(tmp_path))
+    file_store.save_results([("bob", date, RESULT) for date in DATES])
+
+    bad_files = {datetime(2024, 1, 1): "{}", datetime(2024, 1, 2): "[1, 2]", datetime(2024, 1, 3): '[["a"',
+                 datetime(2024, 1, 4): json.dumps([["a", 1, True]] * 70000)}
+
+    for date, data in bad_files.items():
+        with open(os.path.join(file_store.get_user_path("bob"), get_date_file_name(date)), "w") as bad_file:
+            bad_file.write(data)
+
+    store = SqliteResultsStore(str(tmp_path / "results.sqlite3"))
+
+    assert store.import_results(file_store, SAV_IMPORT_KEY) == len(DATES)
+    assert store.get_meta(SAV_IMPORT_KEY)
+
+    # Importing again doesn't copy anything twice
+    assert store.import_results(file_store) == 0
+    assert store.count_attempts("bob") == len(DATES)
+
+    store.close()
+
+
+@pytest.mark.parametrize("first_date, end_date, expected", [
+    (None, None, (6, 6, 6)),
+    (datetime(2023, 3, 6), datetime(2023, 3, 7), (2, 2, 2)),
+    (None, datetime(2023, 3, 1), (0, 0, 0))
+])
+def test_user_totals(store, first_date, end_date, expected):
+    assert store.get_user_totals("bob", first_date, end_date) == expected
@@ -0,0 +1,35 @@
+import random
+
+import pytest
+
+from sampling import UniqueIdSampler, sample_ids
+
+
+@pytest.mark.parametrize("count", [0, 1, 30, 1000])
+def test_sampler_draws_every_id_once(count):
+    sampler = UniqueIdSampler(count, random.Random(count))
+    drawn = []
+
+    while len(sampler):
+        drawn.append(sampler.draw())
+
+    assert sorted(drawn) == list(range(0, count))
+    assert sampler.draw() is None
+
+
+def test_sampler_only_stores_swapped_positions():
+    sampler = UniqueIdSampler(10 ** 9, random.Random(1))
+    drawn = [sampler.draw() for i in range(0, 16)]
+
+    assert len(set(drawn)) == 16
+    assert all(0 <= question_id < 10 ** 9 for question_id in drawn)
+    assert len(sampler.swapped) <= 16
+
+
+@pytest.mark.parametrize("count, amount", [(30, 12), (10, 16), (0, 5)])
+def test_sample_ids(count, amount):
+    ids = sample_ids(count, amount, random.Random(2))
+
+    assert len(ids) == min(count, amount)
+    assert len(set(ids)) == len(ids)
+    assert all(0 <= question_id < count for question_id in ids)
@@ -0,0 +1,57 @@
+import tkinter
+
+# Pools of widgets that get reused instead of being destroyed and made again. Making a Tk widget (and its variable) is
+# slow compared to reconfiguring one, so a pool only makes new widgets when it needs more than it's ever needed before
+
+
+# One of the result summary checkboxes. The box can't be changed by clicking it, it always shows the saved answer
+class SummaryCheckButton:
+    def __init__(self, parent):
+        self.checked_num = 0
+        self.checked = tkinter.IntVar(parent, 0)
+
+        self.object = tkinter.Checkbutton(parent, command=self.clicked, variable=self.checked)
+
+    # Shows a different answer in the checkbox
+    def set_answer(self, checked, answer, colour):
+        self.checked_num = checked and 1 or 0
+        self.checked.set(self.checked_num)
+
+        self.object.config(text=answer, fg=colour)
+
+    def clicked(self):
+        self.checked.set(self.checked_num)
+
+
+# The checkboxes of the result summary. They're packed into their own frame, so showing more or less of them never
+# moves anything else in the window
+class SummaryCheckButtonPool:
+    def __init__(self, parent):
+        self.parent = parent
+
+        self.checkbuttons = []
+
+        # The first shown_count checkbuttons are packed, the rest are waiting to be used
+        self.shown_count = 0
+
+    # Shows a list of (checked, answer, colour) answers, reusing the checkboxes that are already there
+    def show(self, answers):
+        while len(self.checkbuttons) < len(answers):
+            self.checkbuttons.append(SummaryCheckButton(self.parent))
+
+        for i in range(0, len(answers)):
+            checked, answer, colour = answers[i]
+
+            self.checkbuttons[i].set_answer(checked, answer, colour)
+
+        # Packing keeps things in order as long as the checkboxes are always shown and hidden from the end
+        for i in range(self.shown_count, len(answers)):
+            self.checkbuttons[i].object.pack()
+
+        for i in range(len(answers), self.shown_count):
+            self.checkbuttons[i].object.pack_forget()
+
+        self.shown_count = len(answers)
+
+    def hide(self):
+        self.show([])